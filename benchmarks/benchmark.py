@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import time
+
+
+class MozTrapBenchmark(object):
+    '''
+    Times a page object method and counts the WebDriver commands it sends.
+
+    The method is called rounds times. Whatever it needs (a product to delete,
+    a test to pass) is made by an untimed setup call before each round. The
+    result is the median of the rounds, which keeps one slow page load from
+    deciding it.
+    '''
+
+    def __init__(self, selenium, rounds=5, baselines=None):
+        self.selenium = selenium
+        self.rounds = rounds
+        self.baselines = baselines
+        self.commands = 0
+        self.results = {}
+
+        execute = self._execute = selenium.execute
+
+        def counting_execute(driver_command, params=None):
+            self.commands += 1
+            return execute(driver_command, params)
+        # every WebDriver call, find_element and execute_script included, goes through execute
+        selenium.execute = counting_execute
+
+    def close(self):
+        # the browser may go on to other tests from the pool
+        self.selenium.execute = self._execute
+
+    def measure(self, name, action, setup=None):
+        '''
+        Returns {'seconds': ..., 'commands': ...} for one call of action and
+        fails when that is a regression from the baselines.
+
+        Arguments:
+        name -- what the result is stored under, usually the method name
+        action -- called with the arguments setup returns
+        setup -- prepares the round and returns a tuple of arguments for
+                 action, if it needs any; not timed
+        '''
+        seconds = []
+        commands = []
+        for i in range(self.rounds):
+            args = setup() or () if setup else ()
+            self.commands = 0
+            start = time.time()
+            action(*args)
+            seconds.append(time.time() - start)
+            commands.append(self.commands)
+        result = self.results[name] = {'seconds': _median(seconds), 'commands': _median(commands)}
+
+        regressions = self.baselines.regressions(name, result) if self.baselines else []
+        assert not regressions, '\n'.join(regressions)
+        return result
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+class MozTrapBenchmarkReport(object):
+    '''
+    A pytest plugin that collects the benchmark results of all the tests of
+    a run, from the xdist workers too, as {name: {'seconds': ...,
+    'commands': ...}}.
+    '''
+
+    def __init__(self):
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.results.update(getattr(report, 'moztrap_benchmarks', None) or {})
+
+
+class MozTrapBaselines(object):
+    '''
+    The benchmark results a run is compared against, kept in a JSON file:
+
+        {"create_product": {"seconds": 1.52, "commands": 21}, ...}
+
+    A result regresses when its time or its command count is more than
+    threshold (0.2 for 20%) above the baseline.
+    '''
+
+    def __init__(self, path, threshold=0.2):
+        self.path = path
+        self.threshold = threshold
+        self.baselines = {}
+        if os.path.exists(path):
+            with open(path) as baselines_file:
+                self.baselines = json.load(baselines_file)
+
+    def regressions(self, name, result):
+        '''
+        Returns a message for every way result is worse than its baseline.
+        '''
+        baseline = self.baselines.get(name)
+        if not baseline:
+            return []
+        messages = []
+        for measure in ('seconds', 'commands'):
+            if result[measure] > baseline[measure] * (1 + self.threshold):
+                messages.append(u'%(name)s: %(measure)s went from %(baseline)s to %(result)s' % {
+                    'name': name, 'measure': measure, 'baseline': baseline[measure], 'result': result[measure]})
+        return messages
+
+    def save(self, results):
+        '''
+        Makes results the new baselines, keeping those of the benchmarks that
+        did not run.
+        '''
+        self.baselines.update(results)
+        with open(self.path, 'w') as baselines_file:
+            json.dump(self.baselines, baselines_file, indent=4, sort_keys=True)
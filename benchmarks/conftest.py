@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+
+def pytest_funcarg__benchmark(request):
+    '''
+    A MozTrapBenchmark for the logged in browser. Its results are compared
+    with --benchmarkbaselines, or become the new baselines with
+    --benchmarksave.
+    '''
+    mozwebqa = request.getfuncargvalue('mozwebqa_logged_in')
+    option = request.config.option
+    if option.api.upper() != 'WEBDRIVER':
+        pytest.skip('the benchmarks count WebDriver commands, they need --api=webdriver')
+
+    from benchmarks.benchmark import MozTrapBaselines, MozTrapBenchmark
+    baselines = None
+    if not option.benchmark_save:
+        baselines = request.cached_setup(
+            setup=lambda: MozTrapBaselines(option.benchmark_baselines, threshold=option.benchmark_threshold),
+            scope='session')
+    benchmark = MozTrapBenchmark(mozwebqa.selenium, rounds=option.benchmark_rounds, baselines=baselines)
+
+    request._pyfuncitem.moztrap_benchmark = benchmark
+    request.addfinalizer(benchmark.close)
+    return benchmark
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    report = __multicall__.execute()
+    benchmark = getattr(item, 'moztrap_benchmark', None)
+    if call.when == 'teardown' and benchmark:
+        # a plain dict, so it gets from xdist workers to the master with the report
+        report.moztrap_benchmarks = benchmark.results
+    return report
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from pages.base_test import BaseTest
+from pages.create_case_page import MozTrapCreateCasePage
+from pages.create_product_page import MozTrapCreateProductPage
+from pages.create_profile_page import MozTrapCreateProfilePage
+from pages.create_run_page import MozTrapCreateRunPage
+from pages.create_suite_page import MozTrapCreateSuitePage
+from pages.create_version_page import MozTrapCreateVersionPage
+from pages.login_page import MozTrapLoginPage
+from pages.manage_cases_page import MozTrapManageCasesPage
+from pages.manage_products_page import MozTrapManageProductsPage
+from pages.manage_runs_page import MozTrapManageRunsPage
+from pages.manage_suites_page import MozTrapManageSuitesPage
+from pages.manage_versions_page import MozTrapManageVersionsPage
+from pages.run_tests_page import MozTrapRunTestsPage
+
+
+class TestLoginPageBenchmarks(BaseTest):
+
+    def test_login(self, mozwebqa_logged_in, benchmark):
+        login_pg = MozTrapLoginPage(mozwebqa_logged_in)
+
+        def setup():
+            mozwebqa_logged_in.selenium.delete_all_cookies()
+            login_pg.go_to_login_page()
+
+        benchmark.measure('login', login_pg.login, setup=setup)
+
+
+class TestCreatePagesBenchmarks(BaseTest):
+
+    def test_create_product(self, mozwebqa_logged_in, benchmark):
+        create_product_pg = MozTrapCreateProductPage(mozwebqa_logged_in)
+
+        def create_product():
+            self.record(mozwebqa_logged_in, 'product', create_product_pg.create_product())
+
+        benchmark.measure('create_product', create_product,
+                          setup=create_product_pg.go_to_create_product_page)
+
+    def test_create_version(self, mozwebqa_logged_in, benchmark):
+        create_version_pg = MozTrapCreateVersionPage(mozwebqa_logged_in)
+
+        product = self.create_product(mozwebqa_logged_in)
+
+        benchmark.measure('create_version', lambda: create_version_pg.create_version(product_name=product['name']),
+                          setup=create_version_pg.go_to_create_version_page)
+
+    def test_create_suite(self, mozwebqa_logged_in, benchmark):
+        create_suite_pg = MozTrapCreateSuitePage(mozwebqa_logged_in)
+
+        product = self.create_product(mozwebqa_logged_in)
+        case = self.create_case(mozwebqa_logged_in, product=product)
+
+        benchmark.measure('create_suite', lambda: create_suite_pg.create_suite(product=product['name'], case_list=[case['name']]),
+                          setup=create_suite_pg.go_to_create_suite_page)
+
+    def test_create_case(self, mozwebqa_logged_in, benchmark):
+        create_case_pg = MozTrapCreateCasePage(mozwebqa_logged_in)
+
+        product = self.create_product(mozwebqa_logged_in)
+
+        benchmark.measure('create_case', lambda: create_case_pg.create_case(product=product['name'], version=product['version']['name']),
+                          setup=create_case_pg.go_to_create_case_page)
+
+    def test_create_run(self, mozwebqa_logged_in, benchmark):
+        create_run_pg = MozTrapCreateRunPage(mozwebqa_logged_in)
+
+        product = self.create_product(mozwebqa_logged_in)
+        suite = self.create_suite(mozwebqa_logged_in, product=product)
+        product_version = u'%(product_name)s %(version_name)s' % {'product_name': product['name'], 'version_name': product['version']['name']}
+
+        benchmark.measure('create_run', lambda: create_run_pg.create_run(product_version=product_version, suite_list=[suite['name']]),
+                          setup=create_run_pg.go_to_create_run_page)
+
+    def test_create_profile(self, mozwebqa_logged_in, benchmark):
+        create_profile_pg = MozTrapCreateProfilePage(mozwebqa_logged_in)
+
+        def create_profile():
+            self.record(mozwebqa_logged_in, 'profile', create_profile_pg.create_profile())
+
+        benchmark.measure('create_profile', create_profile,
+                          setup=create_profile_pg.go_to_create_profile_page)
+
+
+class TestManagePagesBenchmarks(BaseTest):
+
+    def test_filter_products_by_name(self, mozwebqa_logged_in, benchmark):
+        manage_products_pg = MozTrapManageProductsPage(mozwebqa_logged_in)
+
+        product = self.create_product(mozwebqa_logged_in)
+
+        benchmark.measure('filter_products_by_name', lambda: manage_products_pg.filter_products_by_name(name=product['name']),
+                          setup=manage_products_pg.go_to_manage_products_page)
+
+    def test_filter_versions_by_name(self, mozwebqa_logged_in, benchmark):
+        manage_versions_pg = MozTrapManageVersionsPage(mozwebqa_logged_in)
+
+        version = self.create_version(mozwebqa_logged_in)
+
+        benchmark.measure('filter_versions_by_name', lambda: manage_versions_pg.filter_versions_by_name(name=version['name']),
+                          setup=manage_versions_pg.go_to_manage_versions_page)
+
+    def test_filter_suites_by_name(self, mozwebqa_logged_in, benchmark):
+        manage_suites_pg = MozTrapManageSuitesPage(mozwebqa_logged_in)
+
+        suite = self.create_suite(mozwebqa_logged_in)
+
+        benchmark.measure('filter_suites_by_name', lambda: manage_suites_pg.filter_suites_by_name(name=suite['name']),
+                          setup=manage_suites_pg.go_to_manage_suites_page)
+
+    def test_filter_cases_by_name(self, mozwebqa_logged_in, benchmark):
+        manage_cases_pg = MozTrapManageCasesPage(mozwebqa_logged_in)
+
+        case = self.create_case(mozwebqa_logged_in)
+
+        benchmark.measure('filter_cases_by_name', lambda: manage_cases_pg.filter_cases_by_name(name=case['name']),
+                          setup=manage_cases_pg.go_to_manage_cases_page)
+
+    def test_filter_runs_by_name(self, mozwebqa_logged_in, benchmark):
+        manage_runs_pg = MozTrapManageRunsPage(mozwebqa_logged_in)
+
+        run = self.create_run(mozwebqa_logged_in)
+
+        benchmark.measure('filter_runs_by_name', lambda: manage_runs_pg.filter_runs_by_name(name=run['name']),
+                          setup=manage_runs_pg.go_to_manage_runs_page)
+
+    def test_delete_product(self, mozwebqa_logged_in, benchmark):
+        manage_products_pg = MozTrapManageProductsPage(mozwebqa_logged_in)
+
+        def setup():
+            product = self.create_product(mozwebqa_logged_in)
+            manage_products_pg.go_to_manage_products_page()
+            manage_products_pg.filter_products_by_name(name=product['name'])
+            return (product, )
+
+        def delete_product(product):
+            manage_products_pg.delete_product(name=product['name'])
+            self.forget(mozwebqa_logged_in, 'product', product)
+
+        benchmark.measure('delete_product', delete_product, setup=setup)
+
+    def test_clone_version(self, mozwebqa_logged_in, benchmark):
+        manage_versions_pg = MozTrapManageVersionsPage(mozwebqa_logged_in)
+
+        version = self.create_version(mozwebqa_logged_in)
+
+        def setup():
+            manage_versions_pg.go_to_manage_versions_page()
+            manage_versions_pg.filter_versions_by_name(name=version['name'])
+
+        # the clones are deleted along with the product
+        benchmark.measure('clone_version', lambda: manage_versions_pg.clone_version(name=version['name'], product_name=version['product']['name']),
+                          setup=setup)
+
+    def test_activate_run(self, mozwebqa_logged_in, benchmark):
+        manage_runs_pg = MozTrapManageRunsPage(mozwebqa_logged_in)
+
+        version = self.create_version(mozwebqa_logged_in)
+
+        def setup():
+            run = self.create_run(mozwebqa_logged_in, version=version)
+            manage_runs_pg.go_to_manage_runs_page()
+            manage_runs_pg.filter_runs_by_name(name=run['name'])
+            return (run['name'], )
+
+        benchmark.measure('activate_run', lambda name: manage_runs_pg.activate_run(name=name), setup=setup)
+
+
+class TestRunTestsPageBenchmarks(BaseTest):
+
+    def test_pass_test(self, mozwebqa_logged_in, benchmark):
+        run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
+
+        profile = self.create_profile(mozwebqa_logged_in)
+
+        benchmark.measure('pass_test', lambda case: run_tests_pg.pass_test(case_name=case['name']),
+                          setup=lambda: (self.create_and_run_test(mozwebqa_logged_in, profile=profile), ))
+
+    def test_fail_test(self, mozwebqa_logged_in, benchmark):
+        run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
+
+        profile = self.create_profile(mozwebqa_logged_in)
+
+        benchmark.measure('fail_test', lambda case: run_tests_pg.fail_test(case_name=case['name']),
+                          setup=lambda: (self.create_and_run_test(mozwebqa_logged_in, profile=profile), ))
+
+    def test_mark_test_invalid(self, mozwebqa_logged_in, benchmark):
+        run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
+
+        profile = self.create_profile(mozwebqa_logged_in)
+
+        benchmark.measure('mark_test_invalid', lambda case: run_tests_pg.mark_test_invalid(case_name=case['name']),
+                          setup=lambda: (self.create_and_run_test(mozwebqa_logged_in, profile=profile), ))
+
+    def test_record_results(self, mozwebqa_logged_in, benchmark):
+        run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
+
+        profile = self.create_profile(mozwebqa_logged_in)
+
+        def record_results(cases):
+            run_tests_pg.record_results(dict((case['name'], 'pass') for case in cases))
+
+        benchmark.measure('record_results', record_results,
+                          setup=lambda: (self.create_and_run_tests(mozwebqa_logged_in, profile=profile, count=10), ))
@@ -4,13 +4,13 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-
-def pytest_funcarg__mozwebqa_logged_in(request):
-    mozwebqa = request.getfuncargvalue('mozwebqa')
-
-    from pages.login_page import MozTrapLoginPage
-    login_pg = MozTrapLoginPage(mozwebqa)
-    login_pg.go_to_login_page()
-    login_pg.login()
-
-    return mozwebqa
+# the funcargs, options and reports of the moztrap tests; see the modules
+# for what each one does
+pytest_plugins = ['moztrap_plugins.data',
+                  'moztrap_plugins.browser_pool',
+                  'moztrap_plugins.standin',
+                  'moztrap_plugins.scheduling',
+                  'moztrap_plugins.command_log',
+                  'moztrap_plugins.tracing',
+                  'moztrap_plugins.wait_audit',
+                  'moztrap_plugins.benchmarking']
@@ -0,0 +1,855 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+'''
+A local stand-in for MozTrap that the page objects and tests can run against
+without a network.
+
+It serves the pages the locators in pages/ expect, backed by in-memory data,
+with the same AJAX behaviour (through a small jQuery shim in mocks/static) and
+the parts of the REST API used by --datasetup=api. Start it with
+
+    python -m mocks.moztrap_server --port 8000 --credentials credentials.yaml
+
+and point --baseurl at it, or run py.test with --standin to have one started
+for the test run.
+'''
+
+import itertools
+import json
+import mimetypes
+import optparse
+import os
+import re
+import threading
+import uuid
+
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from Cookie import SimpleCookie
+    from SocketServer import ThreadingMixIn
+    from cgi import escape
+    from urlparse import parse_qs, urlparse
+    from urllib import quote
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from http.cookies import SimpleCookie
+    from socketserver import ThreadingMixIn
+    from html import escape
+    from urllib.parse import parse_qs, quote, urlparse
+
+try:
+    text_type = unicode
+except NameError:
+    text_type = str
+
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+def esc(value):
+    return escape(text_type(value), True)
+
+
+def parse_form(data):
+    '''
+    Parses a query string or form body into a dict of lists of text.
+    '''
+    if bytes is not str and isinstance(data, bytes):
+        data = data.decode('utf-8')
+    parsed = parse_qs(data, keep_blank_values=True)
+    decode = lambda value: value.decode('utf-8') if not isinstance(value, text_type) else value
+    return dict((decode(name), [decode(value) for value in values]) for name, values in parsed.items())
+
+
+class MozTrapState(object):
+    '''
+    The products, versions, suites, cases, runs and environments known to the
+    stand-in, kept in memory as plain dicts keyed by kind and id.
+    '''
+
+    kinds = ('product', 'productversion', 'suite', 'case', 'run', 'category', 'element', 'profile', 'environment')
+
+    def __init__(self):
+        self.objects = dict((kind, {}) for kind in self.kinds)
+        self.results = {}
+        self._ids = itertools.count(1)
+
+    def add(self, kind, **fields):
+        fields['id'] = next(self._ids)
+        self.objects[kind][fields['id']] = fields
+        return fields
+
+    def get(self, kind, id):
+        return self.objects[kind].get(int(id))
+
+    def all(self, kind, **filters):
+        return [obj for obj in sorted(self.objects[kind].values(), key=lambda obj: obj['id'])
+                if all(obj.get(key) == value for key, value in filters.items())]
+
+    def delete(self, kind, id):
+        '''
+        Deletes an object and everything that cannot exist without it.
+        '''
+        obj = self.objects[kind].pop(int(id), None)
+        if obj is None:
+            return False
+        dependents = {
+            'product': [('productversion', 'product'), ('suite', 'product'), ('case', 'product')],
+            'productversion': [('run', 'productversion'), ('case', 'productversion')],
+            'category': [('element', 'category')],
+            'profile': [('environment', 'profile')]}
+        for dependent_kind, key in dependents.get(kind, []):
+            for dependent in self.all(dependent_kind, **{key: obj['id']}):
+                self.delete(dependent_kind, dependent['id'])
+        if kind == 'element':
+            for environment in self.all('environment'):
+                if obj['id'] in environment['elements']:
+                    self.delete('environment', environment['id'])
+        for suite in self.all('suite'):
+            if kind == 'case' and obj['id'] in suite['cases']:
+                suite['cases'].remove(obj['id'])
+        for run in self.all('run'):
+            if kind == 'suite' and obj['id'] in run['suites']:
+                run['suites'].remove(obj['id'])
+        for version in self.all('productversion'):
+            if kind == 'environment' and obj['id'] in version['environments']:
+                version['environments'].remove(obj['id'])
+        return True
+
+    def version_name(self, version):
+        return u'%s %s' % (self.get('product', version['product'])['name'], version['version'])
+
+    def add_profile(self, name, element_ids):
+        '''
+        Adds a profile with an environment for every combination of the given
+        elements across their categories.
+        '''
+        profile = self.add('profile', name=name)
+        by_category = {}
+        for element_id in element_ids:
+            element = self.get('element', element_id)
+            by_category.setdefault(element['category'], []).append(element['id'])
+        for combination in itertools.product(*[by_category[category] for category in sorted(by_category)]):
+            self.add('environment', profile=profile['id'], elements=list(combination))
+        return profile
+
+    def run_cases(self, run):
+        cases = []
+        for suite_id in run['suites']:
+            for case_id in self.get('suite', suite_id)['cases']:
+                if case_id not in cases and self.get('case', case_id):
+                    cases.append(case_id)
+        return [self.get('case', case_id) for case_id in cases]
+
+
+class MozTrapStandInHandler(BaseHTTPRequestHandler):
+    '''
+    Serves the MozTrap pages and API from the server's MozTrapState.
+
+    Routes map a method and path pattern to a handler method, which gets the
+    pattern's groups as arguments and returns (status, headers, body).
+    '''
+
+    routes = [
+        ('GET', r'^/static/(?P<name>[\w.-]+)$', 'static'),
+        ('GET', r'^/users/login/$', 'login_form'),
+        ('POST', r'^/users/login/$', 'login'),
+        ('POST', r'^/users/logout/$', 'logout'),
+        ('GET', r'^/$', 'home'),
+        ('GET', r'^/runtests/_finder/(?P<kind>productversions|runs|environments)/(?P<id>\d+)/$', 'finder'),
+        ('GET', r'^/runtests/environment/(?P<run_id>\d+)/$', 'environment'),
+        ('POST', r'^/runtests/environment/(?P<run_id>\d+)/$', 'choose_environment'),
+        ('GET', r'^/runtests/run/(?P<run_id>\d+)/env/(?P<environment_id>\d+)/$', 'run_tests'),
+        ('POST', r'^/runtests/_result/(?P<run_id>\d+)/(?P<environment_id>\d+)/(?P<case_id>\d+)/$', 'record_result'),
+        ('GET', r'^/manage/(?P<kind>product|productversion|suite|case|run|profile)s/$', 'manage'),
+        ('GET', r'^/manage/(?P<kind>product|productversion|suite|case|run|profile)/add/$', 'create_form'),
+        ('POST', r'^/manage/(?P<kind>product|productversion|suite|case|run|profile)/add/$', 'create'),
+        ('POST', r'^/manage/(?P<kind>\w+)/_delete/(?P<id>\d+)/$', 'delete'),
+        ('POST', r'^/manage/(?P<kind>suite|case|run)/_status/(?P<id>\d+)/$', 'activate'),
+        ('POST', r'^/manage/productversion/_clone/(?P<id>\d+)/$', 'clone_version'),
+        ('POST', r'^/manage/_category/add/$', 'add_category'),
+        ('POST', r'^/manage/_element/add/(?P<category_id>\d+)/$', 'add_element'),
+        ('GET', r'^/api/v1/(?P<resource>\w+)/$', 'api_list'),
+        ('POST', r'^/api/v1/(?P<resource>\w+)/$', 'api_create'),
+        ('GET', r'^/api/v1/(?P<resource>\w+)/(?P<id>\d+)/$', 'api_detail'),
+        ('PUT', r'^/api/v1/(?P<resource>\w+)/(?P<id>\d+)/$', 'api_update'),
+        ('DELETE', r'^/api/v1/(?P<resource>\w+)/(?P<id>\d+)/$', 'api_delete')]
+
+    # pages anyone can see; everything else sends anonymous users to log in
+    public = ('static', 'login_form', 'login', 'api_list', 'api_create', 'api_detail', 'api_update', 'api_delete')
+
+    titles = {
+        'product': 'Products', 'productversion': 'Versions', 'suite': 'Suites',
+        'case': 'Cases', 'run': 'Runs', 'profile': 'Environments'}
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    def do_GET(self):
+        self.dispatch('GET')
+
+    def do_POST(self):
+        self.dispatch('POST')
+
+    def do_PUT(self):
+        self.dispatch('PUT')
+
+    def do_DELETE(self):
+        self.dispatch('DELETE')
+
+    def dispatch(self, method):
+        url = urlparse(self.path)
+        self.query = parse_form(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+        self.body = raw_body.decode('utf-8')
+        self.form = parse_form(raw_body) if method == 'POST' and not self.is_json else {}
+
+        for route_method, pattern, name in self.routes:
+            match = re.match(pattern, url.path)
+            if route_method == method and match:
+                with self.server.lock:
+                    if name not in self.public and not self.user:
+                        response = self.redirect('/users/login/?next=%s' % quote(url.path))
+                    elif name.startswith('api_') and not self.api_user:
+                        response = self.json({'error': 'bad username or api_key'}, status=401)
+                    else:
+                        response = getattr(self, name)(**match.groupdict())
+                break
+        else:
+            response = (404, {'Content-Type': 'text/plain'}, u'Not found')
+
+        status, headers, body = response
+        body = body.encode('utf-8') if isinstance(body, text_type) else body
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @property
+    def is_json(self):
+        return (self.headers.get('Content-Type') or '').startswith('application/json')
+
+    @property
+    def is_ajax(self):
+        return self.headers.get('X-Requested-With') == 'XMLHttpRequest'
+
+    @property
+    def user(self):
+        cookie = SimpleCookie(self.headers.get('Cookie') or '')
+        session = cookie.get('sessionid')
+        return session and self.server.sessions.get(session.value)
+
+    @property
+    def api_user(self):
+        username = self.query.get('username', [None])[0]
+        user = self.server.users.get(username)
+        return user and user.get('api_key') == self.query.get('api_key', [None])[0] and user
+
+    def field(self, name, default=u''):
+        return self.form.get(name, [default])[0]
+
+    # responses
+
+    def html(self, body, status=200, headers=None):
+        response_headers = {'Content-Type': 'text/html; charset=utf-8'}
+        response_headers.update(headers or {})
+        return status, response_headers, body
+
+    def json(self, data, status=200, headers=None):
+        response_headers = {'Content-Type': 'application/json'}
+        response_headers.update(headers or {})
+        return status, response_headers, json.dumps(data)
+
+    def redirect(self, path, headers=None):
+        response_headers = {'Location': path}
+        response_headers.update(headers or {})
+        return 302, response_headers, u''
+
+    def page(self, title, content):
+        header = u''
+        if self.user:
+            header = u'''
+                <header id="header">
+                    <nav id="globalnav"><ul>
+                        <li class="runtests-nav"><a href="/">run tests</a></li>
+                        <li class="manage-nav"><a href="/manage/runs/">manage</a></li>
+                    </ul></nav>
+                    <div id="accountnav">
+                        <span class="account-welcome">Welcome, <span class="fn">%(name)s</span></span>
+                        <form id="logoutform" method="post" action="/users/logout/"><button type="submit">sign out</button></form>
+                    </div>
+                </header>''' % {'name': esc(self.user['name'])}
+        return self.html(u'''<!DOCTYPE html>
+            <html>
+            <head>
+                <meta charset="utf-8">
+                <title>MozTrap: %(title)s</title>
+                <script src="/static/jquery-shim.js"></script>
+                <script src="/static/moztrap.js"></script>
+            </head>
+            <body>%(header)s<div id="content">%(content)s</div></body>
+            </html>''' % {'title': esc(title), 'header': header, 'content': content})
+
+    def options(self, objects, label, selected=None, blank=False):
+        options = blank and [u'<option value="">---------</option>'] or []
+        for obj in objects:
+            options.append(u'<option value="%s"%s>%s</option>' % (
+                obj['id'], obj['id'] == selected and u' selected' or u'', esc(label(obj))))
+        return u''.join(options)
+
+    # static files and users
+
+    def static(self, name):
+        path = os.path.join(STATIC_DIR, name)
+        if not os.path.isfile(path):
+            return 404, {'Content-Type': 'text/plain'}, u'Not found'
+        with open(path, 'rb') as static_file:
+            return 200, {'Content-Type': mimetypes.guess_type(path)[0] or 'text/plain'}, static_file.read()
+
+    def login_form(self, error=u''):
+        return self.page('Login', u'''
+            <section id="login">
+                <form id="loginform" method="post" action="/users/login/">
+                    %(error)s
+                    <div class="formfield"><label for="id_username">username</label><input type="text" id="id_username" name="username"></div>
+                    <div class="formfield"><label for="id_password">password</label><input type="password" id="id_password" name="password"></div>
+                    <div class="form-actions"><button type="submit">login</button><a href="/users/register/">register</a></div>
+                </form>
+            </section>''' % {'error': error})
+
+    def login(self):
+        user = self.server.users.get(self.field('username'))
+        if not user or user.get('password') != self.field('password'):
+            return self.login_form(error=u'<p class="error">Please enter a correct username and password.</p>')
+        session = uuid.uuid4().hex
+        self.server.sessions[session] = user
+        return self.redirect('/', headers={'Set-Cookie': 'sessionid=%s; Path=/' % session})
+
+    def logout(self):
+        cookie = SimpleCookie(self.headers.get('Cookie') or '')
+        self.server.sessions.pop(cookie['sessionid'].value, None)
+        return self.redirect('/users/login/', headers={'Set-Cookie': 'sessionid=; Path=/; expires=Thu, 01 Jan 1970 00:00:00 GMT'})
+
+    # run tests
+
+    def home(self):
+        products = u''.join(
+            u'<li><a href="#" class="title" title="%(name)s" data-url="/runtests/_finder/productversions/%(id)s/">%(name)s</a></li>' % {
+                'name': esc(product['name']), 'id': product['id']}
+            for product in self.state.all('product'))
+        return self.page('Run Tests', u'''
+            <section class="runsdrill">
+                <nav class="drilldown"><h2>run tests</h2></nav>
+                <div class="runsfinder">
+                    <div class="carousel">
+                        <section class="col products"><h3>products</h3><div class="colcontent"><ul>%(products)s</ul></div></section>
+                        <section class="col productversions"><h3>versions</h3><div class="colcontent"></div></section>
+                        <section class="col runs"><h3>runs</h3><div class="colcontent"></div></section>
+                        <section class="col environments"><h3>environment</h3><div class="colcontent"></div></section>
+                    </div>
+                </div>
+            </section>''' % {'products': products})
+
+    def finder(self, kind, id):
+        if kind == 'productversions':
+            product = self.state.get('product', id)
+            items = [u'<li><a href="#" class="title" title="%(name)s" data-product="%(product)s" data-url="/runtests/_finder/runs/%(id)s/">%(name)s</a></li>' % {
+                'name': esc(version['version']), 'product': esc(product['name']), 'id': version['id']}
+                for version in self.state.all('productversion', product=product['id'])]
+        elif kind == 'runs':
+            items = [u'<li><a href="#" class="title" title="%(name)s" data-url="/runtests/_finder/environments/%(id)s/">%(name)s</a></li>' % {
+                'name': esc(run['name']), 'id': run['id']}
+                for run in self.state.all('run', productversion=int(id), status='active')]
+        else:
+            return self.html(self.environment_form(self.state.get('run', id)))
+        return self.html(u'<ul>%s</ul>' % u''.join(items))
+
+    def environment_form(self, run):
+        version = self.state.get('productversion', run['productversion'])
+        categories = {}
+        for environment_id in version['environments']:
+            for element_id in self.state.get('environment', environment_id)['elements']:
+                element = self.state.get('element', element_id)
+                categories.setdefault(element['category'], set()).add(element_id)
+        fields = []
+        for category_id in sorted(categories):
+            category = self.state.get('category', category_id)
+            elements = [self.state.get('element', element_id) for element_id in sorted(categories[category_id])]
+            fields.append(u'<div class="formfield" data-title="%(title)s"><label>%(title)s</label><select name="category-%(id)s">%(options)s</select></div>' % {
+                'title': esc(category['name']), 'id': category['id'],
+                'options': self.options(elements, lambda element: element['name'], blank=True)})
+        return u'''
+            <form id="runtests-environment-form" method="post" action="/runtests/environment/%(id)s/">
+                %(fields)s
+                <div class="form-actions"><button type="submit">run tests in %(name)s</button></div>
+            </form>''' % {'id': run['id'], 'fields': u''.join(fields), 'name': esc(self.state.version_name(version))}
+
+    def environment(self, run_id):
+        return self.page('Run Tests', self.environment_form(self.state.get('run', run_id)))
+
+    def choose_environment(self, run_id):
+        run = self.state.get('run', run_id)
+        chosen = set(int(values[0]) for name, values in self.form.items() if name.startswith('category-') and values[0])
+        environment_id = 0
+        for candidate in self.state.get('productversion', run['productversion'])['environments']:
+            if set(self.state.get('environment', candidate)['elements']) == chosen:
+                environment_id = candidate
+        return self.redirect('/runtests/run/%s/env/%s/' % (run['id'], environment_id))
+
+    def run_tests(self, run_id, environment_id):
+        run = self.state.get('run', run_id)
+        items = []
+        for case in self.state.run_cases(run):
+            status = self.state.results.get((run['id'], int(environment_id), case['id']), (u'', None))[0]
+            steps = u''.join(u'''
+                <li class="stepitem" data-step-number="%(number)s">
+                    <div class="instruction">%(instruction)s</div>
+                    <div class="outcome">%(expected)s</div>
+                    <div class="stepfail">
+                        <button type="button" class="stepfail-summary">fail</button>
+                        <div class="stepfail-content" style="display: none">
+                            <div class="fail-field"><textarea name="comment"></textarea></div>
+                            <div class="form-actions"><button type="button" class="fail">fail test</button></div>
+                        </div>
+                    </div>
+                </li>''' % {'number': number, 'instruction': esc(instruction), 'expected': esc(expected)}
+                for number, (instruction, expected) in enumerate(case['steps'], 1))
+            items.append(u'''
+                <article class="listitem %(status)s" data-title="%(name)s" data-result-url="/runtests/_result/%(run)s/%(environment)s/%(id)s/">
+                    <div class="itembody">
+                        <div class="item-summary"><h3 class="title">%(name)s</h3></div>
+                        <div class="item-content" style="display: none">
+                            <div class="description">%(description)s</div>
+                            <ol class="steps">%(steps)s</ol>
+                            <div class="testinvalid">
+                                <button type="button" class="invalid-summary">invalid</button>
+                                <div class="invalid-form" style="display: none">
+                                    <textarea class="invalid-input" name="comment"></textarea>
+                                    <div class="form-actions"><button type="button" class="invalid">mark invalid</button></div>
+                                </div>
+                            </div>
+                            <button type="button" class="action-pass">pass test</button>
+                        </div>
+                    </div>
+                </article>''' % {
+                'status': status,
+                'name': esc(case['name']), 'run': run['id'], 'environment': environment_id, 'id': case['id'],
+                'description': esc(case['description']), 'steps': steps})
+        return self.page('Run Tests', u'<section id="runtests"><h2>%s</h2><div class="itemlist">%s</div></section>' % (
+            esc(run['name']), u''.join(items)))
+
+    def record_result(self, run_id, environment_id, case_id):
+        status = {'pass': 'passed', 'fail': 'failed', 'invalid': 'invalidated'}[self.field('action')]
+        step = status == 'failed' and int(self.field('step', '0')) or None
+        self.state.results[(int(run_id), int(environment_id), int(case_id))] = (status, step)
+        return self.json({'status': status, 'step': step})
+
+    # manage lists
+
+    def manage(self, kind):
+        filters = dict((name[len('filter-'):], [value.lower() for value in values])
+                       for name, values in self.query.items() if name.startswith('filter-'))
+        objects = [obj for obj in self.state.all(kind) if self.matches(kind, obj, filters)]
+        items = u''.join(getattr(self, '_%s_item' % kind)(obj) for obj in objects)
+        if self.is_ajax:
+            return self.html(items)
+
+        active = u''.join(
+            u'<span class="filter-item"><input type="checkbox" name="filter-%(type)s" data-name="%(type)s" value="%(value)s" checked><span><label class="onoffswitch">%(value)s</label></span></span>' % {
+                'type': esc(type), 'value': esc(value)}
+            for type, values in sorted(filters.items()) for value in values)
+        return self.page('Manage-%s' % self.titles[kind], u'''
+            <section id="filter">
+                <form id="filterform" method="get" action="">
+                    <div class="textual">
+                        <input type="text" id="text-filter" autocomplete="off" data-types="%(types)s">
+                        <ul class="suggest"></ul>
+                    </div>
+                    <div class="filter-group">%(active)s</div>
+                </form>
+            </section>
+            <section id="manage%(kind)ss" class="manage">
+                <a href="/manage/%(kind)s/add/" class="create">create</a>
+                <div class="itemlist">%(items)s</div>
+            </section>''' % {
+            'types': kind == 'productversion' and 'version' or 'name', 'active': active, 'kind': kind, 'items': items})
+
+    def matches(self, kind, obj, filters):
+        for type, values in filters.items():
+            if type == 'suite':
+                if not any(obj['id'] in self.state.get('suite', value)['cases'] for value in values if self.state.get('suite', value)):
+                    return False
+                continue
+            name = obj['version'] if kind == 'productversion' else obj['name']
+            if not any(value in name.lower() for value in values):
+                return False
+        return True
+
+    def _list_item(self, kind, obj, name, controls, extra=u''):
+        return u'''
+            <article id="%(kind)s-id-%(id)s" class="listitem" data-title="%(name)s">
+                <div class="itemhead">
+                    <div class="title" title="%(name)s">%(name)s</div>
+                    %(extra)s
+                    <div class="controls">%(controls)s</div>
+                </div>
+            </article>''' % {'kind': kind, 'id': obj['id'], 'name': esc(name), 'controls': controls, 'extra': extra}
+
+    def _delete_button(self, kind, obj, title=None):
+        return u'<button type="button" class="action-delete" title="%(title)s" data-ajax="remove" data-remove=".listitem" data-url="/manage/%(kind)s/_delete/%(id)s/">delete</button>' % {
+            'title': esc(u'delete %s' % (title or obj['name'])), 'kind': kind, 'id': obj['id']}
+
+    def _status_button(self, kind, obj, classes=u'status-action'):
+        return u'<button type="button" class="%(classes)s" data-ajax="reload" data-url="/manage/%(kind)s/_status/%(id)s/">activate</button>' % {
+            'classes': classes, 'kind': kind, 'id': obj['id']}
+
+    def _product_item(self, product):
+        return self._list_item('product', product, product['name'], self._delete_button('product', product))
+
+    def _productversion_item(self, version):
+        name = self.state.version_name(version)
+        clone = u'<button type="button" class="action-clone" title="%(title)s" data-ajax="reload" data-url="/manage/productversion/_clone/%(id)s/">clone</button>' % {
+            'title': esc(u'clone %s' % name), 'id': version['id']}
+        return self._list_item('productversion', version, name, clone + self._delete_button('productversion', version, title=name))
+
+    def _suite_item(self, suite):
+        casecount = u'<div class="casecount"><a class="drill-link" href="/manage/cases/?filter-suite=%s">%s cases</a></div>' % (suite['id'], len(suite['cases']))
+        status = u'<div class="status"><span class="status-title">%s</span></div>' % suite['status']
+        return self._list_item('suite', suite, suite['name'], self._status_button('suite', suite) + self._delete_button('suite', suite), casecount + status)
+
+    def _case_item(self, case):
+        status = u'<div class="status"><span class="status-title">%s</span></div>' % case['status']
+        return self._list_item('case', case, case['name'], self._status_button('case', case) + self._delete_button('case', case), status)
+
+    def _run_item(self, run):
+        status = u'''
+            <div class="status">
+                <span class="status-title">%(status)s</span>
+                <div class="status-options" style="display: none">%(activate)s</div>
+            </div>''' % {'status': run['status'], 'activate': self._status_button('run', run, classes=u'status-action active')}
+        return self._list_item('run', run, run['name'], self._delete_button('run', run), status)
+
+    def _profile_item(self, profile):
+        return self._list_item('profile', profile, profile['name'], self._delete_button('profile', profile))
+
+    def delete(self, kind, id):
+        self.state.delete(kind, id)
+        return self.json({})
+
+    def activate(self, kind, id):
+        self.state.get(kind, id)['status'] = 'active'
+        return self.json({})
+
+    def clone_version(self, id):
+        version = self.state.get('productversion', id)
+        self.state.add('productversion', product=version['product'], version=version['version'] + '.next',
+                       environments=list(version['environments']))
+        return self.json({})
+
+    # create forms
+
+    def create_form(self, kind):
+        title = {'productversion': 'Version'}.get(kind, kind.capitalize())
+        return self.page('Create %s' % title, getattr(self, '_%s_form' % kind)())
+
+    def _form(self, form_id, fields):
+        return u'''
+            <form id="%(id)s" method="post" action="">
+                %(fields)s
+                <div class="form-actions"><button type="submit">save</button></div>
+            </form>''' % {'id': form_id, 'fields': u''.join(fields)}
+
+    def _input(self, name, tag='input'):
+        if tag == 'textarea':
+            return u'<div class="formfield"><textarea id="id_%(name)s" name="%(name)s"></textarea></div>' % {'name': name}
+        return u'<div class="formfield"><input type="text" id="id_%(name)s" name="%(name)s"></div>' % {'name': name}
+
+    def _select(self, name, options):
+        return u'<div class="formfield"><select id="id_%(name)s" name="%(name)s">%(options)s</select></div>' % {'name': name, 'options': options}
+
+    def _status_select(self):
+        return self._select('status', u''.join(u'<option>%s</option>' % status for status in ('draft', 'active', 'disabled')))
+
+    def _multiselect(self, name, objects):
+        items = u''.join(
+            u'<article class="selectitem" data-title="%(name)s"><div class="bulkselect"><label><input type="checkbox" class="bulk-value" value="%(id)s"> %(name)s</label></div></article>' % {
+                'name': esc(obj['name']), 'id': obj['id']}
+            for obj in objects)
+        return u'''
+            <section class="multiselect" data-name="%(name)s">
+                <section class="multiunselected"><div class="itemlist">%(items)s</div></section>
+                <div class="include-exclude">
+                    <button type="button" class="action-include">include selected</button>
+                    <button type="button" class="action-exclude">exclude selected</button>
+                </div>
+                <section class="multiselected"><div class="itemlist"></div></section>
+            </section>''' % {'name': name, 'items': items}
+
+    def _product_form(self):
+        return self._form('product-add-form', [
+            self._input('name'), self._input('version'),
+            self._select('profile', self.options(self.state.all('profile'), lambda profile: profile['name'], blank=True)),
+            self._input('description', 'textarea')])
+
+    def _productversion_form(self):
+        return self._form('productversion-add-form', [
+            self._select('product', self.options(self.state.all('product'), lambda product: product['name'])),
+            self._input('version')])
+
+    def _suite_form(self):
+        return self._form('suite-add-form', [
+            self._select('product', self.options(self.state.all('product'), lambda product: product['name'])),
+            self._input('name'), self._input('description', 'textarea'), self._status_select(),
+            self._multiselect('cases', self.state.all('case'))])
+
+    def _case_form(self):
+        return self._form('single-case-add', [
+            self._select('product', self.options(self.state.all('product'), lambda product: product['name'])),
+            # like MozTrap, the case form labels versions without their product
+            self._select('productversion', self.options(self.state.all('productversion'), lambda version: version['version'])),
+            self._select('suite', self.options(self.state.all('suite'), lambda suite: suite['name'], blank=True)),
+            self._input('name'), self._input('description', 'textarea'),
+            self._input('steps-0-instruction', 'textarea'), self._input('steps-0-expected', 'textarea'),
+            self._status_select()])
+
+    def _run_form(self):
+        return self._form('run-add-form', [
+            self._input('name'),
+            u'<div class="formfield"><input type="checkbox" id="id_is_series" name="is_series"></div>',
+            self._select('productversion', self.options(self.state.all('productversion'), self.state.version_name)),
+            self._input('description', 'textarea'), self._input('start'), self._input('end'),
+            self._multiselect('suites', self.state.all('suite'))])
+
+    def _profile_form(self):
+        categories = u''.join(self._category_item(category) for category in self.state.all('category'))
+        return self._form('profile-add-form', [
+            self._input('name'),
+            u'''<div class="itemlist">
+                    %(categories)s
+                    <div class="add-item">
+                        <div class="itemhead">add a category</div>
+                        <input type="text" id="new-category-name" name="new-category-name" style="display: none" data-url="/manage/_category/add/">
+                    </div>
+                </div>''' % {'categories': categories}])
+
+    def _category_item(self, category):
+        elements = u''.join(self._element_item(element) for element in self.state.all('element', category=category['id']))
+        return u'''
+            <article class="bulkselectitem" data-title="%(name)s">
+                <div class="itemhead">
+                    <span class="title">%(name)s</span>
+                    <button type="button" class="action-delete" title="delete %(name)s" data-ajax="remove" data-remove=".bulkselectitem" data-url="/manage/category/_delete/%(id)s/">delete</button>
+                </div>
+                <div class="listitem">
+                    <div class="itembody">
+                        <ul class="elements">%(elements)s</ul>
+                        <div class="add-element"><input type="text" name="new-element-name" data-url="/manage/_element/add/%(id)s/"></div>
+                    </div>
+                </div>
+            </article>''' % {'name': esc(category['name']), 'id': category['id'], 'elements': elements}
+
+    def _element_item(self, element):
+        return u'<li class="element" data-title="%(name)s"><label><input type="checkbox" name="elements" value="%(id)s"> %(name)s</label></li>' % {
+            'name': esc(element['name']), 'id': element['id']}
+
+    def add_category(self):
+        return self.html(self._category_item(self.state.add('category', name=self.field('name'))))
+
+    def add_element(self, category_id):
+        return self.html(self._element_item(self.state.add('element', name=self.field('name'), category=int(category_id))))
+
+    def create(self, kind):
+        form = self.form
+        ids = lambda name: [int(value) for value in form.get(name, []) if value]
+        if kind == 'product':
+            product = self.state.add('product', name=self.field('name'), description=self.field('description'))
+            environments = []
+            if self.field('profile'):
+                environments = [environment['id'] for environment in self.state.all('environment', profile=int(self.field('profile')))]
+            self.state.add('productversion', product=product['id'], version=self.field('version'), environments=environments)
+        elif kind == 'productversion':
+            self.state.add('productversion', product=int(self.field('product')), version=self.field('version'), environments=[])
+        elif kind == 'suite':
+            self.state.add('suite', name=self.field('name'), product=int(self.field('product')),
+                           description=self.field('description'), status=self.field('status'), cases=ids('cases'))
+        elif kind == 'case':
+            case = self.state.add('case', name=self.field('name'), product=int(self.field('product')),
+                                  productversion=int(self.field('productversion')), description=self.field('description'),
+                                  status=self.field('status'),
+                                  steps=[(self.field('steps-0-instruction'), self.field('steps-0-expected'))])
+            if self.field('suite'):
+                self.state.get('suite', self.field('suite'))['cases'].append(case['id'])
+        elif kind == 'run':
+            self.state.add('run', name=self.field('name'), productversion=int(self.field('productversion')),
+                           description=self.field('description'), start=self.field('start'), end=self.field('end'),
+                           is_series=bool(self.field('is_series')), status='draft', suites=ids('suites'))
+        elif kind == 'profile':
+            self.state.add_profile(self.field('name'), ids('elements'))
+        return self.redirect('/manage/%ss/' % kind)
+
+    # REST API, the subset pages/api.py uses
+
+    def _api_id(self, uri):
+        return int(uri.rstrip('/').split('/')[-1])
+
+    def _api_object(self, resource, obj):
+        data = dict(obj)
+        data['resource_uri'] = '/api/v1/%s/%s/' % (resource, obj['id'])
+        return data
+
+    def api_list(self, resource):
+        filters = dict((name, values[0]) for name, values in self.query.items()
+                       if name not in ('username', 'api_key', 'limit', 'offset', 'format'))
+        objects = [self._api_object(resource, obj) for obj in self.state.all(resource)
+                   if all(self._api_matches(obj, name, value) for name, value in filters.items())]
+        return self.json({'meta': {'total_count': len(objects)}, 'objects': objects})
+
+    def _api_matches(self, obj, name, value):
+        if name.endswith('__startswith'):
+            return text_type(obj.get(name[:-len('__startswith')])).startswith(value)
+        if '__' in name:
+            # a field of a related object, like product__name
+            relation, name = name.split('__', 1)
+            related = obj.get(relation) is not None and self.state.get(relation, obj[relation])
+            return bool(related) and self._api_matches(related, name, value)
+        return text_type(obj.get(name)) == value
+
+    def api_detail(self, resource, id):
+        obj = self.state.get(resource, id)
+        if obj is None:
+            return self.json({}, status=404)
+        return self.json(self._api_object(resource, obj))
+
+    def api_create(self, resource):
+        data = json.loads(self.body)
+        ref = lambda name: self._api_id(data[name])
+        if resource == 'product':
+            obj = self.state.add('product', name=data['name'], description=data.get('description', u''))
+        elif resource == 'productversion':
+            obj = self.state.add('productversion', product=ref('product'), version=data['version'], environments=[])
+        elif resource == 'suite':
+            obj = self.state.add('suite', name=data['name'], product=ref('product'), description=data.get('description', u''),
+                                 status=data.get('status', 'draft'), cases=[])
+        elif resource == 'suitecase':
+            self.state.get('suite', ref('suite'))['cases'].append(ref('case'))
+            return self.json({}, status=201, headers={'Location': 'http://%s/api/v1/suitecase/0/' % self.headers.get('Host')})
+        elif resource == 'case':
+            obj = self.state.add('case', name=u'', product=ref('product'), productversion=None, description=u'', status='draft', steps=[])
+        elif resource == 'caseversion':
+            # a case has a single version here, sharing its id
+            obj = self.state.get('case', ref('case'))
+            obj.update(productversion=ref('productversion'), name=data['name'],
+                       description=data.get('description', u''), status=data.get('status', 'draft'))
+        elif resource == 'casestep':
+            self.state.get('case', ref('caseversion'))['steps'].append((data['instruction'], data['expected']))
+            return self.json({}, status=201, headers={'Location': 'http://%s/api/v1/casestep/0/' % self.headers.get('Host')})
+        elif resource == 'run':
+            obj = self.state.add('run', name=data['name'], productversion=ref('productversion'), description=data.get('description', u''),
+                                 start=data.get('start'), end=data.get('end'), is_series=data.get('is_series', False),
+                                 status=data.get('status', 'draft'), suites=[])
+        elif resource == 'runsuite':
+            self.state.get('run', ref('run'))['suites'].append(ref('suite'))
+            return self.json({}, status=201, headers={'Location': 'http://%s/api/v1/runsuite/0/' % self.headers.get('Host')})
+        elif resource == 'category':
+            obj = self.state.add('category', name=data['name'])
+        elif resource == 'element':
+            obj = self.state.add('element', name=data['name'], category=ref('category'))
+        elif resource == 'profile':
+            obj = self.state.add_profile(data['name'], [self._api_id(uri) for uri in data.get('elements', [])])
+        else:
+            return self.json({'error': 'unknown resource'}, status=404)
+        return self.json({}, status=201, headers={'Location': 'http://%s/api/v1/%s/%s/' % (self.headers.get('Host'), resource, obj['id'])})
+
+    def api_update(self, resource, id):
+        data = json.loads(self.body)
+        if resource == 'productversionenvironments':
+            self.state.get('productversion', id)['environments'] = [self._api_id(uri) for uri in data['environments']]
+        elif self.state.get(resource, id) is not None:
+            self.state.get(resource, id).update(data)
+        else:
+            return self.json({}, status=404)
+        return self.json({}, status=202)
+
+    def api_delete(self, resource, id):
+        if not self.state.delete(resource, id):
+            return self.json({}, status=404)
+        return 204, {}, u''
+
+
+class MozTrapStandIn(ThreadingMixIn, HTTPServer):
+    '''
+    The stand-in server. users maps usernames to dicts with the 'password',
+    'name' and 'api_key' of each user, as in credentials.yaml.
+    '''
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, users, host='127.0.0.1', port=0, verbose=False):
+        HTTPServer.__init__(self, (host, port), MozTrapStandInHandler)
+        self.users = users
+        self.verbose = verbose
+        self.state = MozTrapState()
+        self.sessions = {}
+        self.lock = threading.RLock()
+        self._thread = None
+
+    @property
+    def url(self):
+        return 'http://%s:%s' % self.server_address
+
+    def start(self):
+        '''Serves requests from a background thread.'''
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def users_from_credentials(credentials):
+    '''
+    Returns the users of a credentials.yaml mapping, keyed by username.
+    '''
+    return dict((user['username'], user) for user in credentials.values() if isinstance(user, dict) and 'username' in user)
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [options]')
+    parser.add_option('--host', default='127.0.0.1', help='address to listen on. (default: %default)')
+    parser.add_option('--port', type='int', default=8000, help='port to listen on. (default: %default)')
+    parser.add_option('--credentials', metavar='path', help='credentials.yaml with the users that can log in.')
+    parser.add_option('--verbose', action='store_true', help='log every request.')
+    options, args = parser.parse_args()
+
+    users = {'moztrap': {'username': 'moztrap', 'password': 'moztrap', 'name': 'MozTrap Tester', 'api_key': 'moztrap'}}
+    if options.credentials:
+        import yaml
+        with open(options.credentials) as credentials_file:
+            users = users_from_credentials(yaml.load(credentials_file))
+
+    server = MozTrapStandIn(users, host=options.host, port=options.port, verbose=options.verbose)
+    print('MozTrap stand-in running at %s' % server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
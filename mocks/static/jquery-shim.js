@@ -0,0 +1,101 @@
+/* This Source Code Form is subject to the terms of the Mozilla Public
+ * License, v. 2.0. If a copy of the MPL was not distributed with this
+ * file, You can obtain one at http://mozilla.org/MPL/2.0/. */
+
+/*
+ * The few parts of jQuery the MozTrap stand-in and the page objects rely on:
+ * $.ajax, $.active and the global ajaxStart/ajaxStop events that
+ * Page.wait_for_ajax listens to. It keeps the stand-in free of downloads.
+ */
+(function (window, document) {
+    'use strict';
+
+    var handlers = {'ajaxStart': [], 'ajaxStop': []};
+
+    var fire = function (name) {
+        for (var i = 0; i < handlers[name].length; i++) {
+            handlers[name][i].call(document);
+        }
+    };
+
+    var jQuery = function (target) {
+        return {
+            'target': target,
+            'ajaxStart': function (handler) {
+                handlers.ajaxStart.push(handler);
+                return this;
+            },
+            'ajaxStop': function (handler) {
+                handlers.ajaxStop.push(handler);
+                return this;
+            }
+        };
+    };
+
+    jQuery.active = 0;
+
+    jQuery.param = function (data) {
+        var pairs = [];
+        var add = function (name, value) {
+            pairs.push(encodeURIComponent(name) + '=' + encodeURIComponent(value));
+        };
+        for (var name in data) {
+            if (!data.hasOwnProperty(name)) {
+                continue;
+            }
+            if (data[name] instanceof Array) {
+                for (var i = 0; i < data[name].length; i++) {
+                    add(name, data[name][i]);
+                }
+            } else {
+                add(name, data[name]);
+            }
+        }
+        return pairs.join('&');
+    };
+
+    jQuery.ajax = function (options) {
+        var request = new XMLHttpRequest();
+        var method = options.type || 'GET';
+        var body = options.data ? jQuery.param(options.data) : null;
+        var url = options.url;
+
+        if (body && method === 'GET') {
+            url += (url.indexOf('?') === -1 ? '?' : '&') + body;
+            body = null;
+        }
+
+        if (jQuery.active++ === 0) {
+            fire('ajaxStart');
+        }
+        request.open(method, url, true);
+        request.setRequestHeader('X-Requested-With', 'XMLHttpRequest');
+        if (body) {
+            request.setRequestHeader('Content-Type', 'application/x-www-form-urlencoded');
+        }
+        request.onreadystatechange = function () {
+            if (request.readyState !== 4) {
+                return;
+            }
+            try {
+                var data = request.responseText;
+                if ((request.getResponseHeader('Content-Type') || '').indexOf('application/json') === 0) {
+                    data = JSON.parse(data);
+                }
+                if (request.status >= 200 && request.status < 300) {
+                    options.success && options.success(data, request);
+                } else {
+                    options.error && options.error(request);
+                }
+            } finally {
+                if (--jQuery.active === 0) {
+                    fire('ajaxStop');
+                }
+            }
+        };
+        request.send(body);
+        return request;
+    };
+
+    window.jQuery = window.$ = jQuery;
+})(window, document);
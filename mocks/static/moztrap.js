@@ -0,0 +1,253 @@
+/* This Source Code Form is subject to the terms of the Mozilla Public
+ * License, v. 2.0. If a copy of the MPL was not distributed with this
+ * file, You can obtain one at http://mozilla.org/MPL/2.0/. */
+
+/*
+ * Behaviour of the MozTrap stand-in pages: the run tests finder, the manage
+ * list filters and actions, the multiselects of the create forms, adding
+ * environment categories and elements, and recording results. Everything
+ * that talks to the server goes through $.ajax so wait_for_ajax sees it.
+ */
+(function (window, document, $) {
+    'use strict';
+
+    var matches = function (element, selector) {
+        var match = element.matches || element.msMatchesSelector || element.webkitMatchesSelector;
+        return match.call(element, selector);
+    };
+
+    var closest = function (element, selector) {
+        for (var node = element; node && node.nodeType === 1; node = node.parentNode) {
+            if (matches(node, selector)) {
+                return node;
+            }
+        }
+        return null;
+    };
+
+    var toggle = function (element, show) {
+        if (element) {
+            element.style.display = show ? '' : 'none';
+        }
+    };
+
+    var post = function (url, data, success) {
+        $.ajax({'type': 'POST', 'url': url, 'data': data || {}, 'success': success});
+    };
+
+    /* manage lists */
+
+    var reloadList = function () {
+        var data = {};
+        var query = [];
+        var inputs = document.querySelectorAll('#filterform .filter-group input:checked');
+        for (var i = 0; i < inputs.length; i++) {
+            (data[inputs[i].name] = data[inputs[i].name] || []).push(inputs[i].value);
+        }
+        query = $.param(data);
+        if (window.history && window.history.replaceState) {
+            window.history.replaceState(null, '', window.location.pathname + (query ? '?' + query : ''));
+        }
+        $.ajax({
+            'url': window.location.pathname,
+            'data': data,
+            'success': function (html) {
+                document.querySelector('.manage .itemlist').innerHTML = html;
+            }
+        });
+    };
+
+    var showSuggestions = function (input) {
+        var suggest = closest(input, '.textual').querySelector('.suggest');
+        var types = (input.getAttribute('data-types') || 'name').split(' ');
+        suggest.innerHTML = '';
+        if (!input.value) {
+            return;
+        }
+        for (var i = 0; i < types.length; i++) {
+            var item = document.createElement('li');
+            var link = document.createElement('a');
+            link.className = 'suggestion';
+            link.href = '#';
+            link.setAttribute('data-type', types[i]);
+            link.setAttribute('data-name', input.value);
+            link.appendChild(document.createTextNode(types[i] + ': ' + input.value));
+            item.appendChild(link);
+            suggest.appendChild(item);
+        }
+    };
+
+    var addFilter = function (type, name) {
+        var group = document.querySelector('#filterform .filter-group');
+        var value = name.toLowerCase();
+        var input = document.getElementById('text-filter');
+        var existing = group.querySelectorAll('input[data-name]');
+
+        input.value = '';
+        showSuggestions(input);
+        for (var i = 0; i < existing.length; i++) {
+            if (existing[i].getAttribute('data-name') === type && existing[i].value === value) {
+                return;
+            }
+        }
+
+        var item = document.createElement('span');
+        var checkbox = document.createElement('input');
+        var span = document.createElement('span');
+        var label = document.createElement('label');
+        item.className = 'filter-item';
+        checkbox.type = 'checkbox';
+        checkbox.name = 'filter-' + type;
+        checkbox.value = value;
+        checkbox.checked = true;
+        checkbox.setAttribute('data-name', type);
+        label.className = 'onoffswitch';
+        label.appendChild(document.createTextNode(value));
+        span.appendChild(label);
+        item.appendChild(checkbox);
+        item.appendChild(span);
+        group.appendChild(item);
+        reloadList();
+    };
+
+    var removeFilter = function (element) {
+        var item = closest(element, '.filter-item');
+        item.parentNode.removeChild(item);
+        reloadList();
+    };
+
+    /* create forms */
+
+    var moveSelected = function (button, include) {
+        var multiselect = closest(button, '.multiselect');
+        var from = multiselect.querySelector(include ? '.multiunselected .itemlist' : '.multiselected .itemlist');
+        var to = multiselect.querySelector(include ? '.multiselected .itemlist' : '.multiunselected .itemlist');
+        var checked = from.querySelectorAll('input.bulk-value:checked');
+        for (var i = 0; i < checked.length; i++) {
+            if (include) {
+                checked[i].name = multiselect.getAttribute('data-name');
+            } else {
+                checked[i].removeAttribute('name');
+                checked[i].checked = false;
+            }
+            to.appendChild(closest(checked[i], '.selectitem'));
+        }
+    };
+
+    /* run tests */
+
+    var recordResult = function (element, action, comment) {
+        var item = closest(element, '.listitem');
+        var step = closest(element, '.stepitem');
+        var data = {'action': action, 'comment': comment || ''};
+        if (step) {
+            data.step = step.getAttribute('data-step-number');
+        }
+        post(item.getAttribute('data-result-url'), data, function (result) {
+            item.className = 'listitem ' + result.status;
+        });
+    };
+
+    var loadColumn = function (title) {
+        var column = closest(title, '.col');
+        var selected = column.querySelectorAll('.title.selected');
+        for (var i = 0; i < selected.length; i++) {
+            selected[i].className = selected[i].className.replace(' selected', '');
+        }
+        title.className += ' selected';
+        var next = column.nextElementSibling;
+        for (var later = next; later; later = later.nextElementSibling) {
+            later.querySelector('.colcontent').innerHTML = '';
+        }
+        $.ajax({
+            'url': title.getAttribute('data-url'),
+            'success': function (html) {
+                next.querySelector('.colcontent').innerHTML = html;
+            }
+        });
+    };
+
+    document.addEventListener('click', function (event) {
+        var target = event.target;
+        var element;
+
+        if ((element = closest(target, '.runsfinder .title[data-url]'))) {
+            event.preventDefault();
+            loadColumn(element);
+        } else if ((element = closest(target, '#filter .suggestion'))) {
+            event.preventDefault();
+            addFilter(element.getAttribute('data-type'), element.getAttribute('data-name'));
+        } else if ((element = closest(target, '#filterform .filter-group .onoffswitch, #filterform .filter-group input'))) {
+            event.preventDefault();
+            removeFilter(element);
+        } else if ((element = closest(target, '[data-ajax]'))) {
+            event.preventDefault();
+            post(element.getAttribute('data-url'), {}, function () {
+                if (element.getAttribute('data-ajax') === 'remove') {
+                    var item = closest(element, element.getAttribute('data-remove'));
+                    item.parentNode.removeChild(item);
+                } else {
+                    reloadList();
+                }
+            });
+        } else if ((element = closest(target, '.status-title'))) {
+            var options = element.parentNode.querySelector('.status-options');
+            toggle(options, options && options.style.display === 'none');
+        } else if ((element = closest(target, '#runtests .item-summary'))) {
+            var content = closest(element, '.itembody').querySelector('.item-content');
+            toggle(content, content.style.display === 'none');
+        } else if ((element = closest(target, '.stepfail-summary'))) {
+            toggle(closest(element, '.stepfail').querySelector('.stepfail-content'), true);
+        } else if ((element = closest(target, '.invalid-summary'))) {
+            toggle(closest(element, '.testinvalid').querySelector('.invalid-form'), true);
+        } else if ((element = closest(target, '#runtests .action-pass'))) {
+            recordResult(element, 'pass');
+        } else if ((element = closest(target, '#runtests .stepfail-content .fail'))) {
+            recordResult(element, 'fail', closest(element, '.stepfail-content').querySelector('textarea').value);
+        } else if ((element = closest(target, '#runtests .invalid-form .invalid'))) {
+            recordResult(element, 'invalid', closest(element, '.invalid-form').querySelector('textarea').value);
+        } else if ((element = closest(target, '.add-item .itemhead'))) {
+            var input = document.getElementById('new-category-name');
+            toggle(input, true);
+            input.focus();
+        } else if ((element = closest(target, '.multiselect .action-include'))) {
+            moveSelected(element, true);
+        } else if ((element = closest(target, '.multiselect .action-exclude'))) {
+            moveSelected(element, false);
+        }
+    });
+
+    document.addEventListener('keyup', function (event) {
+        if (event.target.id === 'text-filter' && event.keyCode !== 13) {
+            showSuggestions(event.target);
+        }
+    });
+
+    document.addEventListener('keydown', function (event) {
+        var target = event.target;
+        if (event.keyCode !== 13) {
+            return;
+        }
+
+        if (target.id === 'text-filter') {
+            event.preventDefault();
+            showSuggestions(target);
+            var first = closest(target, '.textual').querySelector('.suggestion');
+            if (first) {
+                addFilter(first.getAttribute('data-type'), first.getAttribute('data-name'));
+            }
+        } else if (target.id === 'new-category-name') {
+            event.preventDefault();
+            post(target.getAttribute('data-url'), {'name': target.value}, function (html) {
+                closest(target, '.add-item').insertAdjacentHTML('beforebegin', html);
+                target.value = '';
+            });
+        } else if (target.name === 'new-element-name') {
+            event.preventDefault();
+            post(target.getAttribute('data-url'), {'name': target.value}, function (html) {
+                closest(target, '.listitem').querySelector('.elements').insertAdjacentHTML('beforeend', html);
+                target.value = '';
+            });
+        }
+    });
+})(window, document, window.jQuery);
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import os
+
+import py
+
+_benchmarks = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--benchmark',
+                     action='store_true',
+                     dest='benchmark',
+                     default=False,
+                     help='run the page object benchmarks in benchmarks/ as well. they fail when a method got slower or sends more WebDriver commands than its baseline.')
+    group._addoption('--benchmarkrounds',
+                     action='store',
+                     dest='benchmark_rounds',
+                     type='int',
+                     default=5,
+                     metavar='num',
+                     help='number of times each benchmarked method is called. (default: %default)')
+    group._addoption('--benchmarkbaselines',
+                     action='store',
+                     dest='benchmark_baselines',
+                     default=os.path.join(_benchmarks, 'baselines.json'),
+                     metavar='path',
+                     help='JSON file with the benchmark baselines. (default: benchmarks/baselines.json)')
+    group._addoption('--benchmarkthreshold',
+                     action='store',
+                     dest='benchmark_threshold',
+                     type='float',
+                     default=0.2,
+                     metavar='num',
+                     help='fraction a benchmark may be above its baseline before it fails. (default: %default)')
+    group._addoption('--benchmarksave',
+                     action='store_true',
+                     dest='benchmark_save',
+                     default=False,
+                     help='store the benchmark results as the new baselines instead of comparing them.')
+
+
+def pytest_configure(config):
+    if config.option.benchmark and not hasattr(config, 'slaveinput'):
+        # the xdist workers send their results to the master with the reports
+        from benchmarks.benchmark import MozTrapBenchmarkReport
+        config._moztrap_benchmark_report = MozTrapBenchmarkReport()
+        config.pluginmanager.register(config._moztrap_benchmark_report, 'moztrap_benchmark_report')
+
+
+def pytest_ignore_collect(path, config):
+    # the benchmarks take a while, they only run with --benchmark
+    return path == py.path.local(_benchmarks) and not config.option.benchmark
+
+
+def pytest_terminal_summary(terminalreporter):
+    benchmark_report = getattr(terminalreporter.config, '_moztrap_benchmark_report', None)
+    benchmarks = benchmark_report and benchmark_report.results
+    if benchmarks:
+        terminalreporter.write_sep('-', 'moztrap benchmarks')
+        for name in sorted(benchmarks):
+            terminalreporter.write_line('%-40s %8.3fs %6s commands' % (name, benchmarks[name]['seconds'], benchmarks[name]['commands']))
+
+
+def pytest_unconfigure(config):
+    benchmark_report = getattr(config, '_moztrap_benchmark_report', None)
+    if benchmark_report and benchmark_report.results and config.option.benchmark_save:
+        from benchmarks.benchmark import MozTrapBaselines
+        MozTrapBaselines(config.option.benchmark_baselines).save(benchmark_report.results)
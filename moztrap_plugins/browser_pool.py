@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import inspect
+
+
+class MozTrapBrowserPool(object):
+    '''
+    Keeps WebDriver sessions open between tests so each test does not have to
+    wait for a browser to start.
+
+    A session is reset before it is handed to the next test: its cookies and
+    web storage are cleared, it is left on about:blank and its implicit wait
+    is set back to the default. Sessions are quit instead of being reused once
+    they have run max_uses tests, when the test using them failed or when they
+    could not be reset.
+
+    Every process (so every pytest-xdist worker) has a pool of its own.
+    '''
+
+    _clear_storage_script = '''
+        try {
+            window.localStorage.clear();
+            window.sessionStorage.clear();
+        } catch (e) {
+            // storage is not available on every page, about:blank included
+        }
+    '''
+
+    def __init__(self, start_client, size=1, max_uses=50):
+        '''
+        Arguments:
+        start_client -- returns a started pytest-mozwebqa selenium client
+        size -- how many idle sessions to keep open
+        max_uses -- how many tests a session runs before it is quit
+        '''
+        self.start_client = start_client
+        self.size = size
+        self.max_uses = max_uses
+        self.started = 0
+        self.recycled = 0
+        self._idle = []
+        self._uses = {}
+
+    def acquire(self):
+        if self._idle:
+            client = self._idle.pop()
+        else:
+            client = self.start_client()
+            self._uses[client] = 0
+            self.started += 1
+        self._uses[client] += 1
+        return client
+
+    def release(self, client, failed=False):
+        if not failed and self._uses[client] < self.max_uses and len(self._idle) < self.size:
+            try:
+                self.reset(client)
+            except Exception:
+                pass
+            else:
+                self._idle.append(client)
+                return
+        self.recycled += 1
+        self._quit(client)
+
+    def reset(self, client):
+        selenium = client.selenium
+        selenium.execute_script(self._clear_storage_script)
+        selenium.delete_all_cookies()
+        selenium.get('about:blank')
+        selenium.implicitly_wait(client.default_implicit_wait)
+
+    def _quit(self, client):
+        del self._uses[client]
+        try:
+            client.stop()
+        except Exception:
+            # the session is being thrown away because it is broken already
+            pass
+
+    def close(self):
+        while self._idle:
+            self._quit(self._idle.pop())
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--browserpool',
+                     action='store',
+                     dest='browser_pool_size',
+                     type='int',
+                     default=0,
+                     metavar='num',
+                     help='keep up to this many browsers open between the tests that use mozwebqa_pooled or mozwebqa_logged_in instead of starting one per test. webdriver api only, and not with Sauce Labs. (default: %default)')
+    group._addoption('--browserpoolmaxuses',
+                     action='store',
+                     dest='browser_pool_max_uses',
+                     type='int',
+                     default=50,
+                     metavar='num',
+                     help='number of tests a pooled browser runs before it is replaced with a new one. (default: %default)')
+
+
+def pytest_addhooks(pluginmanager):
+    from moztrap_plugins import hookspec
+    pluginmanager.addhooks(hookspec)
+
+
+# tests asking for any of these get a browser from the pool when it is enabled
+_pooled_funcargs = ('mozwebqa_pooled', 'mozwebqa_logged_in')
+
+
+def _browser_pool(config):
+    option = config.option
+    if not option.browser_pool_size or option.api.upper() != 'WEBDRIVER' or option.sauce_labs_credentials_file:
+        return None
+    if not hasattr(config, '_moztrap_browser_pool'):
+        from pytest_mozwebqa.selenium_client import Client
+
+        def start_client():
+            client = Client('moztrap browser pool', option)
+            client.start()
+            return client
+        config._moztrap_browser_pool = MozTrapBrowserPool(start_client,
+                                                          size=option.browser_pool_size,
+                                                          max_uses=option.browser_pool_max_uses)
+    return config._moztrap_browser_pool
+
+
+def pytest_runtest_setup(item):
+    # runs before pytest-mozwebqa's setup hook, which then leaves starting a
+    # browser to the mozwebqa_pooled funcarg
+    if _browser_pool(item.config) and set(_pooled_funcargs) & set(inspect.getargspec(item.obj).args):
+        item.keywords['skip_selenium'] = True
+        item.moztrap_pooled = True
+pytest_runtest_setup.tryfirst = True
+
+
+def pytest_funcarg__mozwebqa_pooled(request):
+    '''
+    The mozwebqa funcarg, with a browser from the pool when --browserpool is
+    given. The browser is handed back to the pool after the test.
+    '''
+    mozwebqa = request.getfuncargvalue('mozwebqa')
+    item = request._pyfuncitem
+    if getattr(item, 'moztrap_pooled', False):
+        pool = _browser_pool(request.config)
+        client = pool.acquire()
+        request.addfinalizer(lambda: pool.release(client, failed=getattr(item, 'moztrap_failed', False)))
+        item.session_id = client.session_id
+        item.moztrap_selenium_client = client
+        mozwebqa.selenium_client = client
+        mozwebqa.selenium = client.selenium
+        mozwebqa.timeout = client.timeout
+        mozwebqa.default_implicit_wait = client.default_implicit_wait
+
+    request.config.hook.pytest_moztrap_browser(request=request, mozwebqa=mozwebqa)
+    return mozwebqa
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    report = __multicall__.execute()
+    if report.failed:
+        # a pooled browser is not reused after a failure, it may be in any state
+        item.moztrap_failed = True
+    client = getattr(item, 'moztrap_selenium_client', None)
+    if report.when == 'call' and client:
+        # pytest-mozwebqa only collects these for the browsers it started itself
+        if report.skipped and 'xfail' in report.keywords or report.failed and 'xfail' not in report.keywords:
+            from pytest_mozwebqa.pytest_mozwebqa import _debug_summary
+            for name, debug in (('urls', client.url), ('screenshots', client.screenshot), ('html', client.html), ('logs', client.log)):
+                debug and item.debug[name].append(debug)
+            report.sections.append(('pytest-mozwebqa', _debug_summary(item.debug)))
+        report.debug = item.debug
+    return report
+
+
+def pytest_terminal_summary(terminalreporter):
+    pool = getattr(terminalreporter.config, '_moztrap_browser_pool', None)
+    if pool:
+        terminalreporter.write_line('moztrap browser pool: %s browsers started, %s replaced' % (pool.started, pool.recycled))
+
+
+def pytest_unconfigure(config):
+    pool = getattr(config, '_moztrap_browser_pool', None)
+    if pool:
+        pool.close()
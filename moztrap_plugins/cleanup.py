@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from pages.create_profile_page import MozTrapCreateProfilePage
+from pages.manage_cases_page import MozTrapManageCasesPage
+from pages.manage_products_page import MozTrapManageProductsPage
+from pages.manage_profiles_page import MozTrapManageProfilesPage
+from pages.manage_runs_page import MozTrapManageRunsPage
+from pages.manage_suites_page import MozTrapManageSuitesPage
+from pages.manage_versions_page import MozTrapManageVersionsPage
+
+
+class MozTrapCleanup(object):
+    '''
+    Records the data a test creates so it can all be deleted after the test.
+
+    Deleting a product deletes its versions, suites, cases and runs with it, so
+    only the entities whose product was not created by the test are deleted on
+    their own. Everything is deleted kind by kind with one visit to each manage
+    page, filtered on the names of all the entities of that kind, or through
+    the API when the test data was set up that way.
+    '''
+
+    # kinds are deleted in this order so nothing is deleted while still in use
+    _sweep_order = ('run', 'case', 'suite', 'version', 'product', 'profile', 'category')
+
+    def __init__(self):
+        self._created = []
+
+    def _name(self, kind, entity):
+        if kind == 'category':
+            return entity['category']
+        return entity['name']
+
+    def add(self, kind, entity, product=None):
+        '''
+        Records an entity created by the test.
+
+        Arguments:
+        kind -- one of 'product', 'version', 'suite', 'case', 'run' or 'profile'
+                (which records its 'category' as well)
+        entity -- the dict returned when the entity was created
+        product -- the product the entity belongs to
+        '''
+        self._created.append((kind, entity, product))
+        if kind == 'profile':
+            # the environment category created with a profile outlives it
+            self._created.append(('category', entity, None))
+
+    def discard(self, kind, entity):
+        '''
+        Forgets an entity the test deleted itself, along with everything that
+        was deleted with it.
+        '''
+        name = self._name(kind, entity)
+        self._created = [(created_kind, created, product) for created_kind, created, product in self._created
+                         if not (created_kind == kind and self._name(kind, created) == name) and
+                         not (kind == 'product' and product is not None and product['name'] == name)]
+
+    def plan(self):
+        '''
+        Returns the (kind, entity, product) records that have to be deleted,
+        in the order they have to be deleted in.
+        '''
+        products = set(entity['name'] for kind, entity, product in self._created if kind == 'product')
+        roots = [(kind, entity, product) for kind, entity, product in self._created
+                 if product is None or product['name'] not in products]
+        return sorted(roots, key=lambda root: self._sweep_order.index(root[0]))
+
+    def sweep(self, testsetup):
+        '''
+        Deletes everything recorded and returns a report of what was deleted,
+        one line per entity.
+        '''
+        report = []
+        plan = self.plan()
+        api = getattr(testsetup, 'moztrap_api', None)
+
+        for kind in self._sweep_order:
+            records = [(entity, product) for root_kind, entity, product in plan if root_kind == kind]
+            if not records:
+                continue
+            try:
+                if api:
+                    deleted, failed = self._sweep_api(api, kind, records)
+                else:
+                    deleted, failed = getattr(self, '_sweep_%s' % kind)(testsetup, records)
+            except Exception as exception:
+                # the manage page could not be loaded, so none of them were deleted
+                deleted, failed = [], [(entity, exception) for entity, product in records]
+            for entity, product in records:
+                errors = [exception for failed_entity, exception in failed if failed_entity is entity]
+                if errors:
+                    report.append(u'could not delete %s %s: %s' % (kind, self._name(kind, entity), errors[0]))
+                elif [deleted_entity for deleted_entity in deleted if deleted_entity is entity]:
+                    dependents = len([created for created in self._created if created[2] is entity])
+                    report.append(u'deleted %s %s%s' % (kind, self._name(kind, entity), dependents and u' and %s created in it' % dependents or u''))
+                else:
+                    report.append(u'found no %s %s to delete' % (kind, self._name(kind, entity)))
+
+        self._created = []
+        return report
+
+    def _delete_each(self, records, delete):
+        # returns the entities delete(entity, product) deleted, as it returns
+        # False for those that were already gone, and the (entity, exception)
+        # of those it could not delete
+        deleted, failed = [], []
+        for entity, product in records:
+            try:
+                if delete(entity, product):
+                    deleted.append(entity)
+            except Exception as exception:
+                failed.append((entity, exception))
+        return deleted, failed
+
+    def _sweep_api(self, api, kind, records):
+        return self._delete_each(records, lambda entity, product: api.delete(entity[kind == 'category' and 'category_uri' or 'uri'], missing_ok=True))
+
+    def _sweep_listed(self, manage_pg, records, locator_key, delete):
+        # a single visit to the manage page lists all of them, and deleting
+        # one only removes it from the list
+        manage_pg.go_to_filtered_page(manage_pg._manage_path, manage_pg._name_filter_type,
+                                      [entity['name'] for entity, product in records])
+
+        def delete_listed(entity, product):
+            if not manage_pg.is_element_present(*entity[locator_key]):
+                return False
+            delete(entity, product)
+            return True
+        return self._delete_each(records, delete_listed)
+
+    def _sweep_product(self, testsetup, records):
+        manage_products_pg = MozTrapManageProductsPage(testsetup)
+        return self._sweep_listed(manage_products_pg, records, 'locator',
+                                  lambda product, parent: manage_products_pg.delete_product(name=product['name']))
+
+    def _sweep_version(self, testsetup, records):
+        manage_versions_pg = MozTrapManageVersionsPage(testsetup)
+        return self._sweep_listed(manage_versions_pg, records, 'manage_locator',
+                                  lambda version, product: manage_versions_pg.delete_version(name=version['name'], product_name=product['name']))
+
+    def _sweep_run(self, testsetup, records):
+        manage_runs_pg = MozTrapManageRunsPage(testsetup)
+        return self._sweep_listed(manage_runs_pg, records, 'manage_locator',
+                                  lambda run, product: manage_runs_pg.delete_run(name=run['name']))
+
+    def _sweep_suite(self, testsetup, records):
+        manage_suites_pg = MozTrapManageSuitesPage(testsetup)
+        return self._sweep_listed(manage_suites_pg, records, 'locator',
+                                  lambda suite, product: manage_suites_pg.delete_suite(name=suite['name']))
+
+    def _sweep_case(self, testsetup, records):
+        manage_cases_pg = MozTrapManageCasesPage(testsetup)
+        return self._sweep_listed(manage_cases_pg, records, 'locator',
+                                  lambda case, product: manage_cases_pg.delete_case(name=case['name']))
+
+    def _sweep_profile(self, testsetup, records):
+        manage_profiles_pg = MozTrapManageProfilesPage(testsetup)
+        return self._sweep_listed(manage_profiles_pg, records, 'locator',
+                                  lambda profile, product: manage_profiles_pg.delete_profile(name=profile['name']))
+
+    def _sweep_category(self, testsetup, records):
+        create_profile_pg = MozTrapCreateProfilePage(testsetup)
+        create_profile_pg.go_to_create_profile_page()
+
+        def delete_category(profile, product):
+            if not create_profile_pg.is_environment_category_present(category_name=profile['category']):
+                return False
+            create_profile_pg.delete_environment_category(category_name=profile['category'])
+            return True
+        return self._delete_each(records, delete_category)
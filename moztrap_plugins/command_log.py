@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import sys
+import time
+
+from pages.page import Page
+
+
+class MozTrapCommandLog(object):
+    '''
+    Records the WebDriver commands a browser sends and the page object
+    methods they were sent for.
+
+    A command is put down to the outermost page object method on the stack,
+    the one the test or BaseTest helper called, like
+    MozTrapManageProductsPage.filter_products_by_name, so whatever that
+    method calls in turn counts towards it. Commands sent outside any page
+    object method are put down to the test.
+    '''
+
+    outside = '(test)'
+
+    def __init__(self, selenium):
+        self.selenium = selenium
+        self.summary = {}
+
+        execute = self._execute = selenium.execute
+
+        def logging_execute(driver_command, params=None):
+            caller = page_method(sys._getframe(1)) or self.outside
+            start = time.time()
+            try:
+                return execute(driver_command, params)
+            finally:
+                self._add(caller, driver_command, time.time() - start)
+        # every WebDriver call, find_element and execute_script included, goes through execute
+        selenium.execute = logging_execute
+
+    def close(self):
+        # the browser may go on to other tests from the pool
+        self.selenium.execute = self._execute
+
+    def lines(self):
+        '''
+        Returns a line per page object method, the chattiest first.
+        '''
+        return format_summary(self.summary)
+
+    def _add(self, caller, driver_command, seconds):
+        method = self.summary.setdefault(caller, {'commands': 0, 'seconds': 0.0, 'names': {}})
+        method['commands'] += 1
+        method['seconds'] += seconds
+        method['names'][driver_command] = method['names'].get(driver_command, 0) + 1
+
+
+def page_method(frame):
+    '''
+    Returns the outermost page object method on the stack of the frame, like
+    'MozTrapManageProductsPage.filter_products_by_name', or None.
+    '''
+    method = None
+    while frame:
+        code = frame.f_code
+        # checking the argument names first keeps the walk cheap
+        if code.co_argcount and code.co_varnames[0] == 'self' and isinstance(frame.f_locals.get('self'), Page):
+            method = '%s.%s' % (type(frame.f_locals['self']).__name__, code.co_name)
+        frame = frame.f_back
+    return method
+
+
+def merge_summaries(summary, other):
+    '''
+    Adds the commands of the other summary to summary.
+    '''
+    for caller, counts in other.items():
+        method = summary.setdefault(caller, {'commands': 0, 'seconds': 0.0, 'names': {}})
+        method['commands'] += counts['commands']
+        method['seconds'] += counts['seconds']
+        for name, commands in counts['names'].items():
+            method['names'][name] = method['names'].get(name, 0) + commands
+    return summary
+
+
+def format_summary(summary, limit=None):
+    '''
+    Returns lines like
+    MozTrapManageProductsPage.filter_products_by_name: 14 commands, 2.3 s
+    for the methods of the summary, the chattiest first.
+    '''
+    callers = sorted(summary, key=lambda caller: (-summary[caller]['commands'], caller))[:limit]
+    return ['%s: %s commands, %.1f s' % (caller, summary[caller]['commands'], summary[caller]['seconds'])
+            for caller in callers]
+
+
+class MozTrapCommandReport(object):
+    '''
+    A pytest plugin that collects the command logs of all the tests of a
+    run, from the xdist workers too, and writes them to a JSON file:
+
+        {"session": {"<page class>.<method>": {"commands": ..., "seconds": ...,
+                                               "names": {"<command>": ...}}},
+         "tests": {"<node id>": {...the same for one test}}}
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.session = {}
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        summary = getattr(report, 'moztrap_commands', None)
+        if summary:
+            self.tests[report.nodeid] = summary
+            merge_summaries(self.session, summary)
+
+    def save(self):
+        with open(self.path, 'w') as report_file:
+            json.dump({'session': self.session, 'tests': self.tests}, report_file, indent=4, sort_keys=True)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--commandlog',
+                     action='store',
+                     dest='command_log',
+                     metavar='path',
+                     help='record the WebDriver commands each page object method sends and write them, per test and for the run, to this JSON file. the chattiest methods are listed at the end of the run.')
+
+
+def pytest_configure(config):
+    if config.option.command_log and not hasattr(config, 'slaveinput'):
+        # the xdist workers send their logs to the master with the reports
+        config._moztrap_command_report = MozTrapCommandReport(config.option.command_log)
+        config.pluginmanager.register(config._moztrap_command_report, 'moztrap_command_report')
+
+
+def pytest_moztrap_browser(request, mozwebqa):
+    if request.config.option.command_log and request.config.option.api.upper() == 'WEBDRIVER':
+        item = request._pyfuncitem
+        item.moztrap_command_log = MozTrapCommandLog(mozwebqa.selenium)
+        request.addfinalizer(item.moztrap_command_log.close)
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    report = __multicall__.execute()
+    command_log = getattr(item, 'moztrap_command_log', None)
+    if report.when == 'teardown' and command_log:
+        # a plain dict, so it gets from xdist workers to the master with the report
+        report.moztrap_commands = command_log.summary
+        report.sections.append(('moztrap commands', '\n'.join(command_log.lines())))
+    return report
+
+
+def pytest_terminal_summary(terminalreporter):
+    command_report = getattr(terminalreporter.config, '_moztrap_command_report', None)
+    if command_report and command_report.session:
+        terminalreporter.write_sep('-', 'moztrap commands, chattiest page object methods')
+        for line in format_summary(command_report.session, limit=20):
+            terminalreporter.write_line(line)
+
+
+def pytest_unconfigure(config):
+    command_report = getattr(config, '_moztrap_command_report', None)
+    if command_report:
+        command_report.save()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pytest
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--datasetup',
+                     action='store',
+                     dest='data_setup',
+                     type='choice',
+                     choices=['ui', 'api'],
+                     default='ui',
+                     metavar='str',
+                     help="how tests create their products, runs, suites etc. 'ui' fills in the create forms, 'api' uses the MozTrap REST API and needs an api_key in the credentials. (default: %default)")
+    group._addoption('--sharedscope',
+                     action='store',
+                     dest='shared_scope',
+                     type='choice',
+                     choices=['class', 'module', 'session'],
+                     default='module',
+                     metavar='str',
+                     help="how widely the shared_* funcargs are shared before being deleted: 'class', 'module' or 'session'. (default: %default)")
+    group._addoption('--sessioncache',
+                     action='store',
+                     dest='session_cache_dir',
+                     metavar='path',
+                     help='directory to keep the cookies of logged in sessions in, so later runs can skip logging in.')
+    group._addoption('--sessionmaxage',
+                     action='store',
+                     dest='session_max_age',
+                     type='int',
+                     default=3600,
+                     metavar='num',
+                     help='seconds a cached login session is reused for before logging in again. (default: %default)')
+    group._addoption('--sweepstale',
+                     action='store',
+                     dest='sweep_stale',
+                     type='float',
+                     metavar='hours',
+                     help='before the tests, delete through the API the products, profiles and environment categories of earlier runs that started more than this many hours ago. needs an api_key in the credentials.')
+
+
+def pytest_configure(config):
+    from pages.naming import naming
+    if hasattr(config, 'slaveinput'):
+        # xdist workers get the run id, like the stand-in's url, from the master's options
+        naming.run_id = config.option.moztrap_run_id
+        naming.worker = config.slaveinput['slaveid']
+        return
+    config.option.moztrap_run_id = naming.run_id
+
+    if config.option.sweep_stale is not None:
+        from datetime import timedelta
+        from pytest_mozwebqa.credentials import read as read_credentials
+        from pages.api import MozTrapAPI
+        from pages.naming import MozTrapStaleSweeper
+
+        class TestSetup(object):
+            base_url = config.option.base_url
+            credentials = read_credentials(config.option.credentials_file)
+        config._moztrap_stale_report = MozTrapStaleSweeper(MozTrapAPI(TestSetup())).sweep(timedelta(hours=config.option.sweep_stale))
+
+
+def pytest_funcarg__mozwebqa_logged_in(request):
+    mozwebqa = request.getfuncargvalue('mozwebqa_pooled')
+
+    mozwebqa.moztrap_api = None
+    if request.config.option.data_setup == 'api':
+        from pages.api import MozTrapAPI
+        # one client, and so one pooled HTTP connection, for the whole session
+        mozwebqa.moztrap_api = request.cached_setup(setup=lambda: MozTrapAPI(mozwebqa), scope='session')
+
+    from moztrap_plugins.cleanup import MozTrapCleanup
+    mozwebqa.moztrap_cleanup = MozTrapCleanup()
+
+    from moztrap_plugins.session_cache import MozTrapSessionCache
+    session_cache = request.cached_setup(
+        setup=lambda: MozTrapSessionCache(mozwebqa.base_url,
+                                          directory=request.config.option.session_cache_dir,
+                                          max_age=request.config.option.session_max_age),
+        scope='session')
+
+    from pages.login_page import MozTrapLoginPage
+    login_pg = MozTrapLoginPage(mozwebqa)
+    cookies = session_cache.get('default')
+    if not (cookies and login_pg.restore_session(cookies)):
+        session_cache.invalidate('default')
+        login_pg.go_to_login_page()
+        login_pg.login()
+        session_cache.set('default', mozwebqa.selenium.get_cookies())
+
+    return mozwebqa
+
+
+def _shared(request, name, create):
+    '''
+    Returns test data shared by all the tests in the same --sharedscope.
+
+    It is created with the logged in browser of the first test that asks for
+    it and deleted after the last test in the scope, so the tests using it
+    must only read it.
+    '''
+    mozwebqa = request.getfuncargvalue('mozwebqa_logged_in')
+    from moztrap_plugins.scheduling import shared_scope_key
+    key = shared_scope_key(request.fspath, request.cls, request.config.option.shared_scope)
+    if not hasattr(request.config, '_moztrap_shared'):
+        request.config._moztrap_shared = {}
+    if key not in request.config._moztrap_shared:
+        from moztrap_plugins.cleanup import MozTrapCleanup
+        request.config._moztrap_shared[key] = {'cleanup': MozTrapCleanup(), 'data': {}, 'api': mozwebqa.moztrap_api}
+    shared = request.config._moztrap_shared[key]
+
+    if name not in shared['data']:
+        # record it for deletion at the end of the scope rather than the test
+        test_cleanup = mozwebqa.moztrap_cleanup
+        mozwebqa.moztrap_cleanup = shared['cleanup']
+        try:
+            shared['data'][name] = create(mozwebqa)
+        finally:
+            mozwebqa.moztrap_cleanup = test_cleanup
+    return shared['data'][name]
+
+
+def pytest_funcarg__shared_version(request):
+    '''A version, in its own product, shared by the tests in the --sharedscope.'''
+    from pages.base_test import BaseTest
+    return _shared(request, 'version', lambda mozwebqa: BaseTest().create_version(mozwebqa))
+
+
+def pytest_funcarg__shared_product(request):
+    '''The product of shared_version.'''
+    return request.getfuncargvalue('shared_version')['product']
+
+
+def pytest_funcarg__shared_run(request):
+    '''An active run in shared_version shared by the tests in the --sharedscope.'''
+    from pages.base_test import BaseTest
+    version = request.getfuncargvalue('shared_version')
+    return _shared(request, 'run', lambda mozwebqa: BaseTest().create_run(mozwebqa, activate=True, version=version))
+
+
+def pytest_funcarg__shared_profile(request):
+    '''A profile shared by the tests in the --sharedscope.'''
+    from pages.base_test import BaseTest
+    return _shared(request, 'profile', lambda mozwebqa: BaseTest().create_profile(mozwebqa))
+
+
+class _APITestSetup(object):
+    # all the cleanup needs to delete through the API, no browser
+    def __init__(self, api):
+        self.moztrap_api = api
+
+
+def _sweep_shared(config, keys, mozwebqa=None, logged_in=False):
+    '''
+    Deletes the shared data of the scopes and returns the cleanup report.
+
+    Data created through the API is deleted through it. The rest needs the
+    browser, which is logged in first when the test did not log in; without
+    one the scope is left for a later test or the end of the session.
+    '''
+    shared = getattr(config, '_moztrap_shared', {})
+    report = []
+    for key in keys:
+        if shared[key]['api']:
+            testsetup = _APITestSetup(shared[key]['api'])
+        elif mozwebqa is None:
+            continue
+        else:
+            if not logged_in:
+                from pages.login_page import MozTrapLoginPage
+                login_pg = MozTrapLoginPage(mozwebqa)
+                try:
+                    login_pg.go_to_login_page()
+                    login_pg.login()
+                except Exception as exception:
+                    report.append(u'could not log in to delete shared data: %s' % exception)
+                    break
+                logged_in = True
+            testsetup = mozwebqa
+        report.extend(shared.pop(key)['cleanup'].sweep(testsetup))
+    return report
+
+
+def _count_swept(config, report):
+    deleted = [line for line in report if line.startswith('deleted')]
+    config._moztrap_swept = getattr(config, '_moztrap_swept', 0) + len(deleted)
+
+
+def pytest_runtest_teardown(item, nextitem):
+    # runs before pytest-mozwebqa's teardown hook closes the browser
+    funcargs = getattr(item, 'funcargs', {})
+    mozwebqa = funcargs.get('mozwebqa_logged_in')
+    item.moztrap_cleanup_report = []
+    cleanup = getattr(mozwebqa, 'moztrap_cleanup', None)
+    if cleanup:
+        item.moztrap_cleanup_report.extend(cleanup.sweep(mozwebqa))
+
+    # shared data goes once no later test in its scope can ask for it,
+    # whether or not this test logged in
+    shared = getattr(item.config, '_moztrap_shared', {})
+    scope = item.config.option.shared_scope
+    next_key = None
+    if nextitem:
+        next_class = nextitem.getparent(pytest.Class)
+        from moztrap_plugins.scheduling import shared_scope_key
+        next_key = shared_scope_key(nextitem.fspath, next_class and next_class.obj, scope)
+    finished = [key for key in shared if key != next_key]
+    if finished:
+        browser = mozwebqa or funcargs.get('mozwebqa_pooled') or funcargs.get('mozwebqa')
+        item.moztrap_cleanup_report.extend(_sweep_shared(item.config, finished, browser, logged_in=mozwebqa is not None))
+
+    _count_swept(item.config, item.moztrap_cleanup_report)
+pytest_runtest_teardown.tryfirst = True
+
+
+def pytest_sessionfinish(session):
+    # whatever the teardowns left, like the data of a scope whose last test
+    # errored before its teardown; runs before the terminal summary
+    config = session.config
+    shared = getattr(config, '_moztrap_shared', {})
+    if shared:
+        _count_swept(config, _sweep_shared(config, list(shared)))
+    config._moztrap_shared_left = sum(len(shared[key]['cleanup'].plan()) for key in shared)
+pytest_sessionfinish.tryfirst = True
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    report = __multicall__.execute()
+    if report.when == 'teardown' and getattr(item, 'moztrap_cleanup_report', None):
+        report.sections.append(('moztrap cleanup', '\n'.join(item.moztrap_cleanup_report)))
+    return report
+
+
+def pytest_terminal_summary(terminalreporter):
+    swept = getattr(terminalreporter.config, '_moztrap_swept', 0)
+    if swept:
+        terminalreporter.write_line('moztrap cleanup: %s deletions after tests' % swept)
+    left = getattr(terminalreporter.config, '_moztrap_shared_left', 0)
+    if left:
+        terminalreporter.write_line('moztrap cleanup: %s shared entities left behind, no browser was left to delete them with' % left)
+    stale = getattr(terminalreporter.config, '_moztrap_stale_report', None)
+    if stale is not None:
+        terminalreporter.write_line('moztrap cleanup: %s stale products, profiles and categories deleted before the tests' % len(stale))
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+def pytest_moztrap_browser(request, mozwebqa):
+    '''
+    Called by the mozwebqa_pooled funcarg with the test's mozwebqa once its
+    browser is started, to wrap it for the test; the wrapping is undone with
+    request.addfinalizer.
+    '''
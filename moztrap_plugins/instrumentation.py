@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import pkgutil
+import sys
+import time
+import types
+
+from selenium.webdriver.support.wait import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from moztrap_plugins import tracing
+from moztrap_plugins import wait_audit
+from pages.page import Page
+
+# the seconds slept so far by the page object waits in progress; the
+# WebDriverWaits they fall back to count towards them, not on their own
+_page_waits = []
+
+
+def _attributes(args, kwargs):
+    # the names, ids and flags the methods are called with; not the
+    # mozwebqa funcarg and other objects
+    attributes = {}
+    for key, value in [('arg%s' % i, value) for i, value in enumerate(args)] + kwargs.items():
+        if isinstance(value, (basestring, int, long, float, bool)):
+            attributes[key] = value
+        elif isinstance(value, dict) and isinstance(value.get('name'), basestring):
+            attributes[key] = value['name']
+    return attributes
+
+
+def _traced(name, category, function):
+    # no self argument, so it is not taken for the page object method itself
+    def traced(*args, **kwargs):
+        tracer = tracing.active
+        if tracer is None:
+            return function(*args, **kwargs)
+        span = tracer.start('%s.%s' % (type(args[0]).__name__, name), category, _attributes(args[1:], kwargs))
+        try:
+            result = function(*args, **kwargs)
+            if isinstance(result, dict) and isinstance(result.get('name'), basestring):
+                span['args']['entity'] = result['name']
+            return result
+        finally:
+            tracer.end(span)
+    traced.__name__ = function.__name__
+    traced.__doc__ = function.__doc__
+    traced.moztrap_traced = True
+    return traced
+
+
+def instrument(cls, category):
+    '''
+    Wraps the public methods defined in the class, not its properties, so
+    they are traced while a tracer is active.
+    '''
+    for name, value in vars(cls).items():
+        if not name.startswith('_') and isinstance(value, types.FunctionType) and not getattr(value, 'moztrap_traced', False):
+            setattr(cls, name, _traced(name, category, value))
+
+
+def instrument_pages():
+    '''
+    Instruments BaseTest and every page object in the pages package.
+    '''
+    import pages
+    for loader, module_name, is_package in pkgutil.iter_modules(pages.__path__):
+        __import__('pages.%s' % module_name)
+    from pages.base_test import BaseTest
+
+    instrument(BaseTest, 'helper')
+    page_classes = [Page]
+    while page_classes:
+        cls = page_classes.pop()
+        instrument(cls, 'page')
+        page_classes.extend(cls.__subclasses__())
+
+
+def _audited(wait, until):
+    def audited(self, method, message=''):
+        auditor = wait_audit.active
+        if auditor is None:
+            return wait(self, method, message)
+        polls = []
+
+        def poll(driver):
+            polls.append(time.time())
+            return method(driver)
+        start = time.time()
+        try:
+            value = wait(self, poll, message)
+        except TimeoutException:
+            if not _page_waits:
+                auditor.add('explicit', sys._getframe(1), time.time() - start, time.time() - start)
+            raise
+        # the condition was met during the sleep before the last poll, or before the first
+        slept = len(polls) > 1 and min(self._poll, polls[-1] - polls[-2]) or 0
+        if _page_waits:
+            _page_waits[-1] += slept
+        else:
+            auditor.add('explicit', sys._getframe(1), time.time() - start, slept)
+        return value
+    audited.__name__ = until
+    return audited
+
+
+def _audited_page_wait(wait, name):
+    # no self argument, so it is not taken for the page object method itself
+    def audited(*args, **kwargs):
+        auditor = wait_audit.active
+        if auditor is None:
+            return wait(*args, **kwargs)
+        _page_waits.append(0.0)
+        start = time.time()
+        try:
+            value = wait(*args, **kwargs)
+        except TimeoutException:
+            auditor.add('explicit', sys._getframe(1), time.time() - start, time.time() - start)
+            raise
+        else:
+            auditor.add('explicit', sys._getframe(1), time.time() - start, _page_waits[-1])
+        finally:
+            _page_waits.pop()
+        return value
+    audited.__name__ = name
+    audited.__doc__ = wait.__doc__
+    return audited
+
+
+def audit_explicit_waits():
+    '''
+    Makes WebDriverWait and the waits of the page objects report to the
+    active auditor. They behave as before while there is none.
+    '''
+    for until in ('until', 'until_not'):
+        wait = getattr(WebDriverWait, until)
+        if not getattr(wait, 'moztrap_audited', False):
+            audited = _audited(wait.im_func, until)
+            audited.moztrap_audited = True
+            setattr(WebDriverWait, until, audited)
+    for name in ('wait_until', 'wait_for_ajax'):
+        wait = getattr(Page, name)
+        if not getattr(wait, 'moztrap_audited', False):
+            audited = _audited_page_wait(wait.im_func, name)
+            audited.moztrap_audited = True
+            setattr(Page, name, audited)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import inspect
+import json
+import os
+
+import py
+
+
+def shared_scope_key(path, cls, scope):
+    '''
+    Returns what the tests that get the same shared_* data in a
+    --sharedscope have in common: nothing for 'session', their module for
+    'module' and their module and class for 'class'.
+    '''
+    return {'session': (), 'module': (path, ), 'class': (path, cls)}[scope]
+
+
+def affinity_key(function, cls, nodeid, shared_scope='module'):
+    '''
+    Returns what a test has in common with the tests it is best run next to,
+    on the same worker, or None for a test that can run anywhere.
+
+    Only the data of the shared_* funcargs is reused from test to test, once
+    created on a worker, so the tests using them go with the other tests of
+    the same --sharedscope.
+    '''
+    if not [funcarg for funcarg in inspect.getargspec(function).args if funcarg.startswith('shared_')]:
+        return None
+    return ('shared', ) + shared_scope_key(nodeid.split('::')[0], cls and cls.__name__, shared_scope)
+
+
+class MozTrapAffinityScheduling(object):
+    '''
+    A pytest-xdist scheduler that sends groups of tests to a worker together.
+
+    The tests are grouped, by their affinity_key or one per group, and every
+    worker is given a whole group at a time, the longest ones first, and a
+    new one when it is about to run out. How long a group takes is the sum of
+    the weights of its tests, their durations in the last runs when there is
+    a MozTrapDurationHistory. Groups longer than their share of the workers
+    are split, so one group can not keep a single worker busy while others
+    idle.
+
+    It has the interface of pytest-xdist 1.8's LoadScheduling and is run
+    with the run() of this module.
+    '''
+
+    def __init__(self, numnodes, group_key, weight=None, log=None):
+        '''
+        Arguments:
+        group_key -- function returning the affinity of a test by its node id
+        weight -- function returning how long a test takes by its node id
+                  (default: the same for all tests)
+        '''
+        self.numnodes = numnodes
+        self.group_key = group_key
+        self.weight = weight or (lambda nodeid: 1)
+        self.node2pending = {}
+        self.node2collection = {}
+        self.groups = []
+        self.log = log and log.affinitysched or py.log.Producer('affinitysched')
+        self.collection_is_completed = False
+
+    def hasnodes(self):
+        return bool(self.node2pending)
+
+    def addnode(self, node):
+        self.node2pending[node] = []
+
+    def tests_finished(self):
+        return self.collection_is_completed and not self.groups
+
+    def addnode_collection(self, node, collection):
+        assert not self.collection_is_completed
+        assert node in self.node2pending
+        self.node2collection[node] = list(collection)
+        if len(self.node2collection) >= self.numnodes:
+            self.collection_is_completed = True
+
+    def remove_item(self, node, item):
+        pending = self.node2pending[node]
+        pending.remove(item)
+        self._send_groups(node)
+        self.log('groups waiting for node: %d' % len(self.groups))
+
+    def remove_node(self, node):
+        pending = self.node2pending.pop(node)
+        if not pending:
+            return
+        crashitem = pending.pop(0)
+        if pending:
+            self.groups.insert(0, pending)
+        return crashitem
+
+    def init_distribute(self):
+        assert self.collection_is_completed
+        collection = list(self.node2collection.values())[0]
+        for node_collection in self.node2collection.values():
+            assert node_collection == collection
+
+        groups = {}
+        weights = {}
+        for nodeid in collection:
+            groups.setdefault(self.group_key(nodeid), []).append(nodeid)
+            weights[nodeid] = self.weight(nodeid)
+        share = float(sum(weights.values())) / self.numnodes
+        self.groups = []
+        for group in groups.values():
+            chunk, chunk_weight = [], 0
+            for nodeid in group:
+                if chunk and chunk_weight + weights[nodeid] > share:
+                    self.groups.append(chunk)
+                    chunk, chunk_weight = [], 0
+                chunk.append(nodeid)
+                chunk_weight += weights[nodeid]
+            self.groups.append(chunk)
+        # longest first, keeping the collection order among equals
+        self.groups.sort(key=lambda group: (-sum(weights[nodeid] for nodeid in group), collection.index(group[0])))
+
+        # dealt round by round, so the longest groups go to different workers
+        nodes = list(self.node2pending)
+        while self.groups and [node for node in nodes if self._send_group(node)]:
+            pass
+
+    def _send_groups(self, node):
+        while self._send_group(node):
+            pass
+
+    def _send_group(self, node):
+        # a worker only runs a test once it knows the next one, so the next
+        # group goes out while the last test of the current one is waiting
+        pending = self.node2pending[node]
+        if len(pending) >= 2 or not self.groups:
+            return False
+        group = self.groups.pop(0)
+        self.log('sending %d tests to %s' % (len(group), node))
+        for nodeid in group:
+            node.send_runtest(nodeid)
+        pending.extend(group)
+        return True
+
+
+class MozTrapNodeIds(object):
+    '''
+    Finds the test functions of pytest node ids in the master process, which
+    does not collect the tests itself under pytest-xdist.
+    '''
+
+    def __init__(self, topdir):
+        self.topdir = py.path.local(topdir)
+        self._modules = {}
+
+    def find(self, nodeid):
+        '''
+        Returns the function and the class, or None, of a test.
+        '''
+        names = [name for name in nodeid.split('::') if name != '()']
+        path = names.pop(0)
+        if path not in self._modules:
+            self._modules[path] = self.topdir.join(path).pyimport()
+        cls = len(names) > 1 and getattr(self._modules[path], names.pop(0)) or None
+        function = getattr(cls or self._modules[path], names[0].split('[')[0])
+        return getattr(function, 'im_func', function), cls
+
+
+class MozTrapDurationHistory(object):
+    '''
+    Keeps how long each test took in the last runs in a JSON file.
+
+    A pytest plugin: it adds up the setup, call and teardown durations of the
+    tests of a run and save() merges those of the tests that passed into the
+    file, keyed by node id along with their moztrap ids. Tests that were
+    renamed or moved are found again by those ids.
+    '''
+
+    def __init__(self, path, node_ids):
+        '''
+        Arguments:
+        node_ids -- a MozTrapNodeIds to find the moztrap ids of the tests with
+        '''
+        self.path = path
+        self.node_ids = node_ids
+        self.history = {}
+        if os.path.exists(path):
+            with open(path) as history_file:
+                self.history = json.load(history_file)
+        self.durations = {}
+        self._failed = set()
+
+    def pytest_runtest_logreport(self, report):
+        self.durations[report.nodeid] = self.durations.get(report.nodeid, 0) + getattr(report, 'duration', 0)
+        if not report.passed:
+            self._failed.add(report.nodeid)
+
+    def seconds(self, nodeid):
+        '''
+        Returns how long a test took in the last runs. Tests that are not in
+        the history are assumed to take as long as the average test.
+        '''
+        if nodeid in self.history:
+            return self.history[nodeid]['seconds']
+        moztrap_ids = self._moztrap_ids(nodeid)
+        for test in self.history.values():
+            if moztrap_ids and test['moztrap'] == moztrap_ids:
+                return test['seconds']
+        if not self.history:
+            return 1
+        return sum(test['seconds'] for test in self.history.values()) / len(self.history)
+
+    def save(self):
+        '''
+        Merges the durations of the tests that passed into the file. Each is
+        averaged with the one recorded before, to even out slow runs.
+        '''
+        for nodeid, seconds in self.durations.items():
+            if nodeid in self._failed:
+                continue
+            if nodeid in self.history:
+                seconds = (self.history[nodeid]['seconds'] + seconds) / 2
+            self.history[nodeid] = {'seconds': round(seconds, 3), 'moztrap': self._moztrap_ids(nodeid)}
+        with open(self.path, 'w') as history_file:
+            json.dump(self.history, history_file, indent=4, sort_keys=True)
+
+    def _moztrap_ids(self, nodeid):
+        try:
+            function, cls = self.node_ids.find(nodeid)
+        except (AttributeError, ImportError, py.error.Error):
+            return []
+        marker = getattr(function, 'moztrap', None)
+        if not marker:
+            return []
+        ids = marker.args[0]
+        return sorted(isinstance(ids, list) and ids or [ids])
+
+
+def run(dsession, sched):
+    '''
+    Runs the tests of a pytest-xdist 1.8 DSession with another scheduler.
+
+    pytest-xdist 1.8 has no hook for schedulers, so this is its
+    pytest_runtestloop with the scheduler passed in.
+    '''
+    from xdist.dsession import Interrupted
+    dsession.sched = sched
+    dsession.shouldstop = False
+    dsession.session_finished = False
+    while not dsession.session_finished:
+        dsession.loop_once()
+        if dsession.shouldstop:
+            raise Interrupted(str(dsession.shouldstop))
+    return True
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--affinity',
+                     action='store_true',
+                     dest='affinity',
+                     default=False,
+                     help='with pytest-xdist -n, send the tests using the shared_* funcargs of the same --sharedscope to the same worker, so the shared data is created once, instead of load balancing them one by one.')
+    group._addoption('--durationhistory',
+                     action='store',
+                     dest='duration_history',
+                     metavar='path',
+                     help='JSON file to keep how long each test took in. with pytest-xdist -n the tests are handed out longest first by the durations of earlier runs, so the workers finish together.')
+
+
+def pytest_configure(config):
+    if config.option.duration_history and not hasattr(config, 'slaveinput'):
+        config._moztrap_duration_history = MozTrapDurationHistory(config.option.duration_history, MozTrapNodeIds(py.path.local()))
+        config.pluginmanager.register(config._moztrap_duration_history, 'moztrap_duration_history')
+
+
+def pytest_runtestloop(session):
+    config = session.config
+    history = getattr(config, '_moztrap_duration_history', None)
+    if not (config.option.affinity or history) or config.getvalue('dist') != 'load':
+        return None
+    dsession = config.pluginmanager.getplugin('dsession')
+    node_ids = MozTrapNodeIds(session.fspath)
+
+    def group_key(nodeid):
+        if not config.option.affinity:
+            return nodeid
+        function, cls = node_ids.find(nodeid)
+        return affinity_key(function, cls, nodeid, shared_scope=config.option.shared_scope) or nodeid
+    return run(dsession, MozTrapAffinityScheduling(len(dsession.nodemanager.specs), group_key,
+                                                   weight=history and history.seconds, log=dsession.log))
+pytest_runtestloop.tryfirst = True
+
+
+def pytest_unconfigure(config):
+    history = getattr(config, '_moztrap_duration_history', None)
+    if history:
+        history.save()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import errno
+import json
+import os
+import time
+
+
+class MozTrapSessionCache(object):
+    '''
+    Remembers the cookies of a logged in MozTrap session for each user role in
+    credentials.yaml, so a browser can be logged in by adding cookies instead
+    of going through the login form.
+
+    The cookies are kept in memory for the life of the process (one pytest-xdist
+    worker) and, when a directory is given, written to <directory>/<role>.json
+    so later runs can pick them up until they are max_age seconds old.
+    '''
+
+    # only these keys are accepted by WebDriver.add_cookie on every driver
+    _cookie_keys = ('name', 'value', 'path', 'secure', 'expiry')
+
+    def __init__(self, base_url, directory=None, max_age=3600):
+        self.base_url = base_url
+        self.directory = directory
+        self.max_age = max_age
+        self._sessions = {}
+
+    def _path(self, role):
+        return os.path.join(self.directory, '%s.json' % role)
+
+    def _is_fresh(self, session):
+        now = time.time()
+        if session['base_url'] != self.base_url or now - session['saved'] > self.max_age:
+            return False
+        return all(cookie.get('expiry') is None or cookie['expiry'] > now for cookie in session['cookies'])
+
+    def get(self, role):
+        '''
+        Returns the cookies stored for role, or None when there are none that
+        are still fresh.
+        '''
+        session = self._sessions.get(role)
+        if session is None and self.directory:
+            try:
+                with open(self._path(role)) as session_file:
+                    session = json.load(session_file)
+            except IOError as e:
+                if e.errno != errno.ENOENT:
+                    raise
+            except ValueError:
+                # not written by set(), which never leaves a partial file
+                session = None
+        if session is None or not self._is_fresh(session):
+            return None
+        self._sessions[role] = session
+        return session['cookies']
+
+    def set(self, role, cookies):
+        session = {
+            'base_url': self.base_url,
+            'saved': time.time(),
+            'cookies': [dict((key, cookie[key]) for key in self._cookie_keys if key in cookie) for cookie in cookies]}
+        self._sessions[role] = session
+
+        if self.directory:
+            # other workers may be creating it at the same time
+            try:
+                os.makedirs(self.directory)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+            # write then rename so other workers never read a partial file
+            temp_path = '%s.%s' % (self._path(role), os.getpid())
+            with open(temp_path, 'w') as session_file:
+                json.dump(session, session_file)
+            os.rename(temp_path, self._path(role))
+
+    def invalidate(self, role):
+        self._sessions.pop(role, None)
+        if self.directory:
+            # or another worker removing it at the same time
+            try:
+                os.remove(self._path(role))
+            except OSError as e:
+                if e.errno != errno.ENOENT:
+                    raise
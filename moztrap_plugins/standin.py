@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--standin',
+                     action='store_true',
+                     dest='standin',
+                     default=False,
+                     help='run the tests against a local MozTrap stand-in (mocks/moztrap_server.py) started for the run instead of --baseurl. the users in --credentials can log in to it.')
+
+
+def pytest_configure(config):
+    # xdist workers get the stand-in's url with the master's options
+    if not config.option.standin or hasattr(config, 'slaveinput'):
+        return
+    from pytest_mozwebqa import credentials
+    from mocks.moztrap_server import MozTrapStandIn, users_from_credentials
+    users = {}
+    if config.option.credentials_file:
+        users = users_from_credentials(credentials.read(config.option.credentials_file))
+    config._moztrap_standin = MozTrapStandIn(users).start()
+    config.option.base_url = config._moztrap_standin.url
+# before anything, like --sweepstale, uses the base url
+pytest_configure.tryfirst = True
+
+
+def pytest_unconfigure(config):
+    standin = getattr(config, '_moztrap_standin', None)
+    if standin:
+        standin.stop()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import time
+
+# the tracer of the test running in this process, None when not tracing
+active = None
+
+
+class MozTrapTracer(object):
+    '''
+    Records the spans of a test in the Chrome trace event format, which
+    chrome://tracing and Perfetto open.
+
+    Every BaseTest helper and public page object method called while the
+    tracer is active gets a span, and so does every WebDriver command of the
+    browser it wraps. Spans nest by time, so create_and_run_test shows the
+    create_* helpers it called and those the page object methods and
+    commands they sent.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.pid = os.getpid()
+        self.events = []
+        # the page last loaded with get, clicks that leave it go unnoticed
+        self.url = None
+
+    def start(self, name, category, args=None):
+        '''
+        Opens a span and returns it, to be passed to end().
+        '''
+        span = {'name': name, 'cat': category, 'ph': 'X', 'ts': _now(), 'pid': self.pid, 'tid': 1, 'args': args or {}}
+        self.events.append(span)
+        return span
+
+    def end(self, span):
+        span['dur'] = _now() - span['ts']
+        if span['cat'] == 'page' and self.url:
+            span['args']['url'] = self.url
+
+    def add(self, name, category, start, stop, args=None):
+        '''
+        Records a span that is already over, start and stop in seconds.
+        '''
+        self.events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': int(start * 1000000),
+                            'dur': int((stop - start) * 1000000), 'pid': self.pid, 'tid': 1, 'args': args or {}})
+
+    def wrap(self, selenium):
+        '''
+        Records the WebDriver commands of the browser until unwrap().
+        '''
+        execute = selenium.execute
+
+        def tracing_execute(driver_command, params=None):
+            args = {}
+            if driver_command == 'get':
+                self.url = args['url'] = params['url']
+            elif params and 'using' in params:
+                args['locator'] = u'%s=%s' % (params['using'], params['value'])
+            span = self.start(driver_command, 'webdriver', args)
+            try:
+                return execute(driver_command, params)
+            finally:
+                self.end(span)
+        selenium.execute = tracing_execute
+        return lambda: setattr(selenium, 'execute', execute)
+
+    def save(self, directory):
+        '''
+        Writes the trace to <directory>/<test node id>.json and returns the path.
+        '''
+        file_name = ''.join(c if c.isalnum() or c in '.-' else '_' for c in self.name) + '.json'
+        path = os.path.join(directory, file_name)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as trace_file:
+            json.dump({'traceEvents': sorted(self.events, key=lambda event: event['ts']),
+                       'displayTimeUnit': 'ms',
+                       'otherData': {'test': self.name}}, trace_file, indent=1)
+        return path
+
+
+def _now():
+    return int(time.time() * 1000000)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--tracedir',
+                     action='store',
+                     dest='trace_dir',
+                     metavar='path',
+                     help='write a trace of every test, with spans for the BaseTest helpers, page object methods and WebDriver commands it ran, to this directory. the Chrome trace format files open in chrome://tracing or Perfetto.')
+
+
+def pytest_configure(config):
+    if config.option.trace_dir:
+        from moztrap_plugins.instrumentation import instrument_pages
+        instrument_pages()
+
+
+def pytest_runtest_setup(item):
+    # before pytest-mozwebqa starts the browser, so that is traced too
+    global active
+    if item.config.option.trace_dir:
+        active = MozTrapTracer(item.nodeid)
+pytest_runtest_setup.tryfirst = True
+
+
+def pytest_moztrap_browser(request, mozwebqa):
+    if active and request.config.option.api.upper() == 'WEBDRIVER':
+        request.addfinalizer(active.wrap(mozwebqa.selenium))
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    global active
+    report = __multicall__.execute()
+    if active:
+        active.add(call.when, 'test', call.start, call.stop)
+        if call.when == 'teardown':
+            active.save(item.config.option.trace_dir)
+            active = None
+    return report
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+import os
+import sys
+import time
+
+from selenium.webdriver.remote.command import Command
+from selenium.common.exceptions import NoSuchElementException
+
+from moztrap_plugins.command_log import page_method
+
+# the auditor of the test running in this process, None when not auditing
+active = None
+
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the modules that wrap WebDriver, which are never the call site
+_wrappers = ('benchmarks.benchmark', 'moztrap_plugins.command_log', 'moztrap_plugins.instrumentation',
+             'moztrap_plugins.tracing', __name__)
+
+_find_commands = (Command.FIND_ELEMENT, Command.FIND_ELEMENTS, Command.FIND_CHILD_ELEMENT, Command.FIND_CHILD_ELEMENTS)
+
+
+class MozTrapWaitAuditor(object):
+    '''
+    Records the time a test spends waiting, and how much of it was for
+    nothing, by call site.
+
+    Implicit waits: finding an element while the implicit wait is on takes
+    as long as the element takes to turn up, or the whole implicit wait when
+    it never does. A check that expects it not to be there, like
+    is_element_visible returning False, has waited all that time for nothing.
+
+    Explicit waits: WebDriverWait polls its condition and sleeps in between,
+    so the condition was met some time during the last sleep; that sleep is
+    counted as wasted, and the whole wait when it times out. Page.wait_until
+    and Page.wait_for_ajax wait in the browser and return as soon as they
+    can, so only their timeouts and their polling fallback are wasted.
+    '''
+
+    def __init__(self, implicit_wait):
+        '''
+        Arguments:
+        implicit_wait -- the implicit wait of the browser in seconds
+        '''
+        self.implicit_wait = implicit_wait
+        self.sites = {}
+
+    def wrap(self, selenium):
+        '''
+        Audits the implicit waits of the browser; returns a function that
+        stops it.
+        '''
+        execute = selenium.execute
+
+        def auditing_execute(driver_command, params=None):
+            if driver_command == Command.IMPLICIT_WAIT or driver_command == Command.SET_TIMEOUTS and params.get('type') == 'implicit':
+                self.implicit_wait = params['ms'] / 1000.0
+            if driver_command not in _find_commands or not self.implicit_wait:
+                return execute(driver_command, params)
+            start = time.time()
+            try:
+                response = execute(driver_command, params)
+            except NoSuchElementException:
+                self.add('implicit', sys._getframe(1), time.time() - start, time.time() - start)
+                raise
+            # find_elements waits out the implicit wait too when there are none
+            wasted = not response.get('value') and time.time() - start or 0
+            self.add('implicit', sys._getframe(1), time.time() - start, wasted)
+            return response
+        selenium.execute = auditing_execute
+        return lambda: setattr(selenium, 'execute', execute)
+
+    def add(self, kind, frame, seconds, wasted):
+        key = '%s wait at %s' % (kind, call_site(frame))
+        site = self.sites.setdefault(key, {'waits': 0, 'seconds': 0.0, 'wasted': 0.0})
+        site['waits'] += 1
+        site['seconds'] += seconds
+        site['wasted'] += wasted
+
+
+def call_site(frame):
+    '''
+    Returns where in this repository the frame was called from, like
+    'pages/page.py:271 is_element_visible (MozTrapHomePage.is_user_logged_in)'.
+    '''
+    method = page_method(frame)
+    while frame and (not frame.f_code.co_filename.startswith(_root) or frame.f_globals.get('__name__') in _wrappers):
+        frame = frame.f_back
+    if not frame:
+        return '(outside the tests)'
+    site = '%s:%s %s' % (os.path.relpath(frame.f_code.co_filename, _root), frame.f_lineno, frame.f_code.co_name)
+    return method and '%s (%s)' % (site, method) or site
+
+
+def merge_sites(sites, other):
+    '''
+    Adds the waits of the other sites to sites.
+    '''
+    for key, waits in other.items():
+        site = sites.setdefault(key, {'waits': 0, 'seconds': 0.0, 'wasted': 0.0})
+        for name in ('waits', 'seconds', 'wasted'):
+            site[name] += waits[name]
+    return sites
+
+
+def format_sites(sites, limit=None):
+    '''
+    Returns lines like
+    12.0 s wasted of 12.4 s in 4 waits: implicit wait at pages/page.py:271 ...
+    for the call sites, the most wasteful first.
+    '''
+    keys = sorted(sites, key=lambda key: (-sites[key]['wasted'], key))[:limit]
+    return ['%.1f s wasted of %.1f s in %s waits: %s' % (sites[key]['wasted'], sites[key]['seconds'], sites[key]['waits'], key)
+            for key in keys]
+
+
+class MozTrapWaitReport(object):
+    '''
+    A pytest plugin that collects the wait audits of all the tests of a run,
+    from the xdist workers too, and writes them to a JSON file:
+
+        {"session": {"<kind> wait at <call site>": {"waits": ..., "seconds": ...,
+                                                    "wasted": ...}},
+         "tests": {"<node id>": {...the same for one test}}}
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.session = {}
+        self.tests = {}
+
+    def pytest_runtest_logreport(self, report):
+        sites = getattr(report, 'moztrap_waits', None)
+        if sites:
+            self.tests[report.nodeid] = sites
+            merge_sites(self.session, sites)
+
+    def save(self):
+        with open(self.path, 'w') as report_file:
+            json.dump({'session': self.session, 'tests': self.tests}, report_file, indent=4, sort_keys=True)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('moztrap', 'moztrap')
+    group._addoption('--waitaudit',
+                     action='store',
+                     dest='wait_audit',
+                     metavar='path',
+                     help='record the time spent in implicit and explicit waits, and how much of it was not needed, by call site, and write it per test and for the run to this JSON file. the most wasteful call sites are listed at the end of the run.')
+
+
+def pytest_configure(config):
+    if not config.option.wait_audit:
+        return
+    from moztrap_plugins.instrumentation import audit_explicit_waits
+    audit_explicit_waits()
+    if not hasattr(config, 'slaveinput'):
+        # the xdist workers send their audits to the master with the reports
+        config._moztrap_wait_report = MozTrapWaitReport(config.option.wait_audit)
+        config.pluginmanager.register(config._moztrap_wait_report, 'moztrap_wait_report')
+
+
+def pytest_moztrap_browser(request, mozwebqa):
+    global active
+    if request.config.option.wait_audit and request.config.option.api.upper() == 'WEBDRIVER':
+        active = MozTrapWaitAuditor(mozwebqa.default_implicit_wait)
+        request.addfinalizer(active.wrap(mozwebqa.selenium))
+
+
+def pytest_runtest_makereport(__multicall__, item, call):
+    global active
+    report = __multicall__.execute()
+    if active and call.when == 'teardown':
+        # a plain dict, so it gets from xdist workers to the master with the report
+        report.moztrap_waits = active.sites
+        report.sections.append(('moztrap waits', '\n'.join(format_sites(active.sites))))
+        active = None
+    return report
+
+
+def pytest_terminal_summary(terminalreporter):
+    wait_report = getattr(terminalreporter.config, '_moztrap_wait_report', None)
+    if wait_report and wait_report.session:
+        terminalreporter.write_sep('-', 'moztrap waits, most time wasted')
+        for line in format_sites(wait_report.session, limit=20):
+            terminalreporter.write_line(line)
+
+
+def pytest_unconfigure(config):
+    wait_report = getattr(config, '_moztrap_wait_report', None)
+    if wait_report:
+        wait_report.save()
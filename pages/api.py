@@ -0,0 +1,253 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import json
+from datetime import datetime
+from urlparse import urlparse
+
+import requests
+
+from pages.create_case_page import MozTrapCreateCasePage
+from pages.create_product_page import MozTrapCreateProductPage
+from pages.create_profile_page import MozTrapCreateProfilePage
+from pages.create_run_page import MozTrapCreateRunPage
+from pages.create_suite_page import MozTrapCreateSuitePage
+from pages.create_version_page import MozTrapCreateVersionPage
+from pages.naming import naming
+
+
+class MozTrapAPI(object):
+    '''
+    Creates and deletes MozTrap data through the REST API instead of the UI.
+
+    The create_* methods return the same dicts as the create_* page objects
+    (name, locator, manage_locator, homepage_locator, ...) plus the 'uri' of
+    the created resource, so tests can use either interchangeably.
+    '''
+
+    _api_path = '/api/v1/%(resource)s/'
+
+    def __init__(self, testsetup, user='default'):
+        credentials = testsetup.credentials[user]
+        self.base_url = testsetup.base_url
+        self.auth = {'username': credentials['username'], 'api_key': credentials['api_key']}
+        # a single session keeps the connection to the server alive between calls
+        self.session = requests.session()
+        self._uris = {}
+
+    def _url(self, resource):
+        if resource.startswith('/'):
+            return self.base_url + resource
+        return self.base_url + self._api_path % {'resource': resource}
+
+    def _params(self, **kwargs):
+        params = dict(self.auth)
+        params.update(kwargs)
+        return params
+
+    def get(self, resource, **kwargs):
+        response = self.session.get(self._url(resource), params=self._params(**kwargs))
+        response.raise_for_status()
+        return json.loads(response.content)
+
+    def post(self, resource, data):
+        response = self.session.post(self._url(resource),
+                                     data=json.dumps(data),
+                                     params=self._params(),
+                                     headers={'Content-Type': 'application/json'})
+        response.raise_for_status()
+        # the uri of the new resource is only returned in the Location header
+        return urlparse(response.headers['location']).path
+
+    def put(self, uri, data):
+        response = self.session.put(self._url(uri),
+                                    data=json.dumps(data),
+                                    params=self._params(),
+                                    headers={'Content-Type': 'application/json'})
+        response.raise_for_status()
+
+    def delete(self, uri, permanent=True, missing_ok=False):
+        params = permanent and self._params(permanent='True') or self._params()
+        response = self.session.delete(self._url(uri), params=params)
+        if missing_ok and response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def _remember(self, resource, name, uri):
+        self._uris[(resource, name)] = uri
+
+    def _lookup(self, resource, key, match, **filters):
+        '''
+        Returns the uri of a resource created earlier in this session, asking
+        the API for it if this client did not create it.
+
+        Of the objects the filters return, exactly one has to match; anything
+        else raises LookupError rather than handing out the wrong resource.
+        '''
+        if (resource, key) not in self._uris:
+            objects = [obj for obj in self.get(resource, limit=0, **filters)['objects'] if match(obj)]
+            if len(objects) != 1:
+                raise LookupError(u'%(count)s %(resource)ss named "%(key)s" found, expected 1' % {
+                    'count': len(objects), 'resource': resource, 'key': key})
+            self._uris[(resource, key)] = objects[0]['resource_uri']
+        return self._uris[(resource, key)]
+
+    def _lookup_name(self, resource, name):
+        return self._lookup(resource, name, lambda obj: obj['name'] == name, name=name)
+
+    def _lookup_version(self, product_name, version_name):
+        # runs and cases refer to versions the way the UI select does: "<product> <version>"
+        return self._lookup('productversion', u'%s %s' % (product_name, version_name),
+                            lambda obj: obj['version'] == version_name,
+                            product__name=product_name, version=version_name)
+
+    def create_product(self, name='Test Product', version='Test Version', desc='This is a test product', profile=None):
+        dt_string = datetime.utcnow().isoformat()
+        product_locator = MozTrapCreateProductPage._product_locator
+        version_manage_locator = MozTrapCreateProductPage._version_manage_locator
+        version_homepage_locator = MozTrapCreateProductPage._version_homepage_locator
+        product = {}
+        product['name'] = naming.unique(name, dt_string)
+        product['desc'] = u'%(desc)s created on %(dt_string)s' % {'desc': desc, 'dt_string': dt_string}
+        product['locator'] = product_locator(product_name=product['name'])
+        product['version'] = {}
+        product['version']['name'] = naming.unique(version, dt_string)
+        product['version']['manage_locator'] = version_manage_locator(product_name=product['name'], version_name=product['version']['name'])
+        product['version']['homepage_locator'] = version_homepage_locator(product_name=product['name'], version_name=product['version']['name'])
+
+        product['uri'] = self.post('product', {'name': product['name'], 'description': product['desc']})
+        self._remember('product', product['name'], product['uri'])
+        product['version']['uri'] = self._post_version(product['name'], product['version']['name'])
+
+        if profile:
+            profile_id = self._lookup_name('profile', profile).rstrip('/').split('/')[-1]
+            environments = self.get('environment', profile=profile_id, limit=0)['objects']
+            self.put(product['version']['uri'].replace('productversion', 'productversionenvironments'),
+                     {'environments': [environment['resource_uri'] for environment in environments]})
+
+        return product
+
+    def _post_version(self, product_name, version_name):
+        uri = self.post('productversion', {
+            'product': self._lookup_name('product', product_name),
+            'version': version_name,
+            'codename': ''})
+        self._remember('productversion', u'%s %s' % (product_name, version_name), uri)
+        return uri
+
+    def create_version(self, name='Test Version', product_name='Test Product'):
+        dt_string = datetime.utcnow().isoformat()
+        version_manage_locator = MozTrapCreateVersionPage._version_manage_locator
+        version_homepage_locator = MozTrapCreateVersionPage._version_homepage_locator
+        version = {}
+        version['name'] = naming.unique(name, dt_string)
+        version['manage_locator'] = version_manage_locator(product_name=product_name, version_name=version['name'])
+        version['homepage_locator'] = version_homepage_locator(product_name=product_name, version_name=version['name'])
+
+        version['uri'] = self._post_version(product_name, version['name'])
+
+        return version
+
+    def create_suite(self, name='Test Suite', product='Test Product', desc='This is a test suite', status='active', case_list=None):
+        dt_string = datetime.utcnow().isoformat()
+        suite_locator = MozTrapCreateSuitePage._suite_locator
+        suite = {}
+        suite['name'] = naming.unique(name, dt_string)
+        suite['desc'] = u'%(desc)s created on %(dt_string)s' % {'desc': desc, 'dt_string': dt_string}
+        suite['locator'] = suite_locator(suite_name=suite['name'])
+
+        suite['uri'] = self.post('suite', {
+            'name': suite['name'],
+            'description': suite['desc'],
+            'product': self._lookup_name('product', product),
+            'status': status})
+        self._remember('suite', suite['name'], suite['uri'])
+
+        for order, case_name in enumerate(case_list or []):
+            self.post('suitecase', {
+                'suite': suite['uri'],
+                'case': self._lookup_name('case', case_name),
+                'order': order})
+
+        return suite
+
+    def create_case(self, name='Test Case', product='Test Product', version='Test Version', suite=None, desc='This is a test case', step1_instruction='Test Case step 1 instruction', step1_result='Test Case step 1 expected result', status='active'):
+        dt_string = datetime.utcnow().isoformat()
+        case_locator = MozTrapCreateCasePage._case_locator
+        case = {}
+        case['name'] = naming.unique(name, dt_string)
+        case['desc'] = u'%(desc)s created on %(dt_string)s' % {'desc': desc, 'dt_string': dt_string}
+        case['locator'] = case_locator(case_name=case['name'])
+
+        case['uri'] = self.post('case', {'product': self._lookup_name('product', product), 'idprefix': ''})
+        self._remember('case', case['name'], case['uri'])
+        caseversion_uri = self.post('caseversion', {
+            'case': case['uri'],
+            'productversion': self._lookup_version(product, version),
+            'name': case['name'],
+            'description': case['desc'],
+            'status': status})
+        self.post('casestep', {
+            'caseversion': caseversion_uri,
+            'number': 1,
+            'instruction': step1_instruction,
+            'expected': step1_result})
+
+        if suite:
+            self.post('suitecase', {'suite': self._lookup_name('suite', suite), 'case': case['uri'], 'order': 0})
+
+        return case
+
+    def create_run(self, name='Test Run', product='Test Product', version='Test Version', desc='This is a test run', start_date='2011-01-01', end_date='2012-12-31', suite_list=None, series_run=False, activate=False):
+        dt_string = datetime.utcnow().isoformat()
+        run_manage_locator = MozTrapCreateRunPage._run_manage_locator
+        run_homepage_locator = MozTrapCreateRunPage._run_homepage_locator
+        run = {}
+        run['name'] = naming.unique(name, dt_string)
+        run['desc'] = u'%(desc)s created on %(dt_string)s' % {'desc': desc, 'dt_string': dt_string}
+        run['series'] = series_run
+        run['manage_locator'] = run_manage_locator(run_name=run['name'])
+        run['homepage_locator'] = run_homepage_locator(run_name=run['name'])
+        run['run_tests_locator'] = MozTrapCreateRunPage._run_tests_button_locator
+
+        run['uri'] = self.post('run', {
+            'name': run['name'],
+            'description': run['desc'],
+            'productversion': self._lookup_version(product, version),
+            'start': start_date,
+            'end': end_date,
+            'is_series': series_run,
+            'status': 'draft'})
+        run['id'] = int(run['uri'].rstrip('/').split('/')[-1])
+
+        for order, suite_name in enumerate(suite_list or []):
+            self.post('runsuite', {
+                'run': run['uri'],
+                'suite': self._lookup_name('suite', suite_name),
+                'order': order})
+
+        if activate:
+            # activating a run snapshots its suites, so it has to happen last
+            self.put(run['uri'], {'status': 'active'})
+
+        return run
+
+    def create_profile(self, name='Test Profile', category_name='Test Category', element_name='Test Element'):
+        dt_string = datetime.utcnow().isoformat()
+        profile_locator = MozTrapCreateProfilePage._profile_locator
+        profile = {}
+        profile['name'] = naming.unique(name, dt_string)
+        profile['category'] = naming.unique(category_name, dt_string)
+        profile['element'] = naming.unique(element_name, dt_string)
+        profile['locator'] = profile_locator(profile_name=profile['name'])
+
+        profile['category_uri'] = self.post('category', {'name': profile['category']})
+        element_uri = self.post('element', {'name': profile['element'], 'category': profile['category_uri']})
+        profile['uri'] = self.post('profile', {'name': profile['name'], 'elements': [element_uri]})
+        self._remember('profile', profile['name'], profile['uri'])
+
+        return profile
@@ -5,7 +5,6 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from pages.home_page import MozTrapHomePage
-from pages.run_tests_page import MozTrapRunTestsPage
 from pages.create_case_page import MozTrapCreateCasePage
 from pages.manage_cases_page import MozTrapManageCasesPage
 from pages.create_suite_page import MozTrapCreateSuitePage
@@ -20,52 +19,110 @@ from pages.create_profile_page import MozTrapCreateProfilePage
 from pages.manage_profiles_page import MozTrapManageProfilesPage
 
 
+def lands_on(page_class, go_to_page):
+    '''
+    Decorator for the create_* helpers.
+
+    Submitting a create form leaves the browser on the matching manage page
+    and tests rely on that. Data set up through the API never touches the
+    browser, so once the outermost helper returns it is sent there instead.
+    '''
+    def decorator(create):
+        def wrapper(self, mozwebqa, *args, **kwargs):
+            self._setup_depth = getattr(self, '_setup_depth', 0) + 1
+            try:
+                entity = create(self, mozwebqa, *args, **kwargs)
+            finally:
+                self._setup_depth -= 1
+            if self._setup_depth == 0 and self.api(mozwebqa):
+                getattr(page_class(mozwebqa), go_to_page)()
+            return entity
+        wrapper.__name__ = create.__name__
+        wrapper.__doc__ = create.__doc__
+        return wrapper
+    return decorator
+
+
 class BaseTest(object):
     '''
     Base class for all Tests
     '''
 
+    def api(self, mozwebqa):
+        '''
+        Returns the MozTrapAPI client when the run was started with
+        --datasetup=api, None when test data goes through the UI.
+        '''
+        return getattr(mozwebqa, 'moztrap_api', None)
+
+    def record(self, mozwebqa, kind, entity, product=None):
+        '''
+        Records created test data so it gets deleted after the test.
+        '''
+        cleanup = getattr(mozwebqa, 'moztrap_cleanup', None)
+        if cleanup:
+            cleanup.add(kind, entity, product=product)
+
+    def forget(self, mozwebqa, kind, entity):
+        '''
+        Tells the cleanup the test deleted this data itself.
+        '''
+        cleanup = getattr(mozwebqa, 'moztrap_cleanup', None)
+        if cleanup:
+            cleanup.discard(kind, entity)
+
+    @lands_on(MozTrapManageProductsPage, 'go_to_manage_products_page')
     def create_product(self, mozwebqa, profile=None):
         create_product_pg = MozTrapCreateProductPage(mozwebqa)
 
-        create_product_pg.go_to_create_product_page()
-        product = create_product_pg.create_product(profile=profile)
+        if self.api(mozwebqa):
+            product = self.api(mozwebqa).create_product(profile=profile)
+        else:
+            create_product_pg.go_to_create_product_page()
+            product = create_product_pg.create_product(profile=profile)
+        self.record(mozwebqa, 'product', product)
 
         return product
 
     def delete_product(self, mozwebqa, product):
         manage_products_pg = MozTrapManageProductsPage(mozwebqa)
 
-        manage_products_pg.go_to_manage_products_page()
         manage_products_pg.filter_products_by_name(name=product['name'])
         manage_products_pg.delete_product(name=product['name'])
+        self.forget(mozwebqa, 'product', product)
 
+    @lands_on(MozTrapManageVersionsPage, 'go_to_manage_versions_page')
     def create_version(self, mozwebqa, product=None):
         create_version_pg = MozTrapCreateVersionPage(mozwebqa)
 
         if product is None:
             product = self.create_product(mozwebqa)
             version = product['version']
-            manage_versions_pg = MozTrapManageVersionsPage(mozwebqa)
-            manage_versions_pg.go_to_manage_versions_page()
+            if not self.api(mozwebqa):
+                manage_versions_pg = MozTrapManageVersionsPage(mozwebqa)
+                manage_versions_pg.go_to_manage_versions_page()
+        elif self.api(mozwebqa):
+            version = self.api(mozwebqa).create_version(product_name=product['name'])
         else:
             create_version_pg.go_to_create_version_page()
             version = create_version_pg.create_version(product_name=product['name'])
 
         version['product'] = product
+        self.record(mozwebqa, 'version', version, product=product)
 
         return version
 
     def delete_version(self, mozwebqa, version, delete_product=False):
         manage_versions_pg = MozTrapManageVersionsPage(mozwebqa)
 
-        manage_versions_pg.go_to_manage_versions_page()
         manage_versions_pg.filter_versions_by_name(name=version['name'])
         manage_versions_pg.delete_version(name=version['name'], product_name=version['product']['name'])
+        self.forget(mozwebqa, 'version', version)
 
         if delete_product:
             self.delete_product(mozwebqa, product=version['product'])
 
+    @lands_on(MozTrapManageRunsPage, 'go_to_manage_runs_page')
     def create_run(self, mozwebqa, activate=False, product=None, version=None, suite_name_list=None):
         create_run_pg = MozTrapCreateRunPage(mozwebqa)
 
@@ -74,10 +131,18 @@ class BaseTest(object):
         if product is None:
             product = version['product']
 
-        create_run_pg.go_to_create_run_page()
         product_version = u'%(product_name)s %(version_name)s' % {'product_name': product['name'], 'version_name': version['name']}
+
+        if self.api(mozwebqa):
+            run = self.api(mozwebqa).create_run(product=product['name'], version=version['name'], suite_list=suite_name_list, activate=activate)
+            run['version'] = version
+            self.record(mozwebqa, 'run', run, product=product)
+            return run
+
+        create_run_pg.go_to_create_run_page()
         run = create_run_pg.create_run(product_version=product_version, suite_list=suite_name_list)
         run['version'] = version
+        self.record(mozwebqa, 'run', run, product=product)
 
         if activate:
             manage_runs_pg = MozTrapManageRunsPage(mozwebqa)
@@ -89,35 +154,41 @@ class BaseTest(object):
     def delete_run(self, mozwebqa, run, delete_version=False, delete_product=False):
         manage_runs_pg = MozTrapManageRunsPage(mozwebqa)
 
-        manage_runs_pg.go_to_manage_runs_page()
         manage_runs_pg.filter_runs_by_name(name=run['name'])
         manage_runs_pg.delete_run(name=run['name'])
+        self.forget(mozwebqa, 'run', run)
 
         if delete_version:
             self.delete_version(mozwebqa, version=run['version'], delete_product=delete_product)
 
+    @lands_on(MozTrapManageSuitesPage, 'go_to_manage_suites_page')
     def create_suite(self, mozwebqa, status='active', product=None, case_name_list=None):
         create_suite_pg = MozTrapCreateSuitePage(mozwebqa)
 
         if product is None:
             product = self.create_product(mozwebqa)
 
-        create_suite_pg.go_to_create_suite_page()
-        suite = create_suite_pg.create_suite(product=product['name'], status=status, case_list=case_name_list)
+        if self.api(mozwebqa):
+            suite = self.api(mozwebqa).create_suite(product=product['name'], status=status, case_list=case_name_list)
+        else:
+            create_suite_pg.go_to_create_suite_page()
+            suite = create_suite_pg.create_suite(product=product['name'], status=status, case_list=case_name_list)
         suite['product'] = product
+        self.record(mozwebqa, 'suite', suite, product=product)
 
         return suite
 
     def delete_suite(self, mozwebqa, suite, delete_product=False):
         manage_suites_pg = MozTrapManageSuitesPage(mozwebqa)
 
-        manage_suites_pg.go_to_manage_suites_page()
         manage_suites_pg.filter_suites_by_name(name=suite['name'])
         manage_suites_pg.delete_suite(name=suite['name'])
+        self.forget(mozwebqa, 'suite', suite)
 
         if delete_product:
             self.delete_product(mozwebqa, product=suite['product'])
 
+    @lands_on(MozTrapManageCasesPage, 'go_to_manage_cases_page')
     def create_case(self, mozwebqa, status='active', product=None, version=None, suite_name=None):
         create_case_pg = MozTrapCreateCasePage(mozwebqa)
 
@@ -127,27 +198,36 @@ class BaseTest(object):
         elif version is None:
             version = product['version']
 
-        create_case_pg.go_to_create_case_page()
-        case = create_case_pg.create_case(product=product['name'], version=version['name'], status=status, suite=suite_name)
+        if self.api(mozwebqa):
+            case = self.api(mozwebqa).create_case(product=product['name'], version=version['name'], status=status, suite=suite_name)
+        else:
+            create_case_pg.go_to_create_case_page()
+            case = create_case_pg.create_case(product=product['name'], version=version['name'], status=status, suite=suite_name)
         case['product'] = product
+        self.record(mozwebqa, 'case', case, product=product)
 
         return case
 
     def delete_case(self, mozwebqa, case, delete_product=False):
         manage_cases_pg = MozTrapManageCasesPage(mozwebqa)
 
-        manage_cases_pg.go_to_manage_cases_page()
         manage_cases_pg.filter_cases_by_name(name=case['name'])
         manage_cases_pg.delete_case(name=case['name'])
+        self.forget(mozwebqa, 'case', case)
 
         if delete_product:
             self.delete_product(mozwebqa, product=case['product'])
 
+    @lands_on(MozTrapManageProfilesPage, 'go_to_manage_profiles_page')
     def create_profile(self, mozwebqa):
         create_profile_pg = MozTrapCreateProfilePage(mozwebqa)
 
-        create_profile_pg.go_to_create_profile_page()
-        profile = create_profile_pg.create_profile()
+        if self.api(mozwebqa):
+            profile = self.api(mozwebqa).create_profile()
+        else:
+            create_profile_pg.go_to_create_profile_page()
+            profile = create_profile_pg.create_profile()
+        self.record(mozwebqa, 'profile', profile)
 
         return profile
 
@@ -155,27 +235,45 @@ class BaseTest(object):
         create_profile_pg = MozTrapCreateProfilePage(mozwebqa)
         manage_profiles_pg = MozTrapManageProfilesPage(mozwebqa)
 
-        manage_profiles_pg.go_to_manage_profiles_page()
         manage_profiles_pg.filter_profiles_by_name(name=profile['name'])
         manage_profiles_pg.delete_profile(name=profile['name'])
         create_profile_pg.go_to_create_profile_page()
         create_profile_pg.delete_environment_category(category_name=profile['category'])
+        self.forget(mozwebqa, 'profile', profile)
+        self.forget(mozwebqa, 'category', profile)
+
+    def run_id(self, mozwebqa, run):
+        '''
+        Returns the id of a run, looking it up in the manage runs list for
+        runs created through the UI.
+        '''
+        if 'id' not in run:
+            run['id'] = MozTrapManageRunsPage(mozwebqa).get_run_id(name=run['name'])
+        return run['id']
 
     def create_and_run_test(self, mozwebqa, profile=None):
+        return self.create_and_run_tests(mozwebqa, profile=profile)[0]
+
+    def create_and_run_tests(self, mozwebqa, profile=None, count=1):
+        '''
+        Creates a run of count cases and starts running it, returning the
+        cases.
+        '''
         home_pg = MozTrapHomePage(mozwebqa)
-        manage_suites_pg = MozTrapManageSuitesPage(mozwebqa)
-        run_tests_pg = MozTrapRunTestsPage(mozwebqa)
 
         if profile is None:
             profile = self.create_profile(mozwebqa)
 
         product = self.create_product(mozwebqa, profile=profile['name'])
         suite = self.create_suite(mozwebqa, product=product)
-        case = self.create_case(mozwebqa, product=product, version=product['version'], suite_name=suite['name'])
-        case['profile'] = profile
+        cases = []
+        for i in range(count):
+            case = self.create_case(mozwebqa, product=product, version=product['version'], suite_name=suite['name'])
+            case['profile'] = profile
+            cases.append(case)
         run = self.create_run(mozwebqa, activate=True, product=product, version=product['version'], suite_name_list=[suite['name']])
 
-        home_pg.go_to_homepage_page()
-        home_pg.go_to_run_test(product_name=product['name'], version_name=product['version']['name'], run_name=run['name'], env_category=profile['category'], env_element=profile['element'])
+        home_pg.go_to_run_environment(self.run_id(mozwebqa, run))
+        home_pg.select_environment(env_category=profile['category'], env_element=profile['element'])
 
-        return case
+        return cases
@@ -5,40 +5,52 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.select import Select
 
 from pages.base_page import MozTrapBasePage
+from pages.page import Locator
 
 
 class MozTrapHomePage(MozTrapBasePage):
 
     _page_title = 'Run Tests'
 
-    _select_locator = (By.CSS_SELECTOR, '.runsdrill .runsfinder .carousel .colcontent .title[title="%(item_name)s"]')
-    _env_select_locator = (By.CSS_SELECTOR, '#runtests-environment-form .formfield[data-title="%(env_category)s"] select')
+    _select_locator = Locator(By.CSS_SELECTOR, '.runsdrill .runsfinder .carousel .colcontent .title[title="%(item_name)s"]')
+    _env_select_locator = Locator(By.CSS_SELECTOR, '#runtests-environment-form .formfield[data-title="%(env_category)s"] select')
     _language_locator = (By.CSS_SELECTOR, '#runtests-environment-form .language-field select')
     _os_locator = (By.CSS_SELECTOR, '#runtests-environment-form .operating-system-field select')
     _submit_locator = (By.CSS_SELECTOR, '#runtests-environment-form .form-actions button[type="submit"]')
 
+    _run_environment_path = '/runtests/environment/%(run_id)s/'
+
     def go_to_homepage_page(self):
         self.selenium.get(self.base_url + '/')
         self.is_the_current_page
 
     def select_item(self, name):
-        _select_locator = (self._select_locator[0], self._select_locator[1] % {'item_name': name})
+        _select_locator = self._select_locator(item_name=name)
 
         self.selenium.find_element(*_select_locator).click()
         self.wait_for_ajax()
 
     def go_to_run_test(self, product_name, version_name, run_name, env_category, env_element):
-        #This has not been migrated properly yet because I have NFI what it does
-
-        _env_select_locator = (self._env_select_locator[0], self._env_select_locator[1] % {'env_category': env_category})
-
+        '''
+        Drills down to the run in the runs finder and starts running it in
+        the environment.
+        '''
         self.select_item(product_name)
         self.select_item(version_name)
         self.select_item(run_name)
+        self.select_environment(env_category, env_element)
+
+    def go_to_run_environment(self, run_id):
+        '''
+        Opens the environment form of the run with this id straight from its
+        URL, instead of drilling down to it in the runs finder.
+        '''
+        self.get_relative_path(self._run_environment_path % {'run_id': run_id})
+
+    def select_environment(self, env_category, env_element):
+        _env_select_locator = self._env_select_locator(env_category=env_category)
 
-        env_select = Select(self.selenium.find_element(*_env_select_locator))
-        env_select.select_by_visible_text(env_element)
+        self.select_option(_env_select_locator, text=env_element)
         self.selenium.find_element(*self._submit_locator).click()
@@ -44,6 +44,26 @@ class MozTrapLoginPage(MozTrapBasePage):
 
         return MozTrapHomePage(self.testsetup)
 
+    def restore_session(self, cookies):
+        '''
+        Logs in by adding the cookies of an earlier login to the browser.
+
+        Returns False when the server no longer accepts them.
+        '''
+        # cookies can only be added for the domain of the page that is loaded
+        self.go_to_login_page()
+        for cookie in cookies:
+            self.selenium.add_cookie(cookie)
+
+        from home_page import MozTrapHomePage
+        home_pg = MozTrapHomePage(self.testsetup)
+        home_pg.get_relative_path('/')
+        if home_pg.is_element_present(*home_pg.header._logout_locator):
+            return True
+
+        self.selenium.delete_all_cookies()
+        return False
+
     @property
     def is_browserid_visible(self):
         return self.is_element_visible(*self._browserid_locator)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import abc
+import urllib
+
+from pages.base_page import MozTrapBasePage
+
+
+class MozTrapManagePage(MozTrapBasePage):
+    '''
+    The list of a manage page, like /manage/products/, and its name filter.
+
+    A manage page gives the _manage_path of its list and types into its
+    filter in _type_name_filter; _name_filter_type is the data-type of the
+    suggestions the filter offers when it is not name.
+    '''
+
+    __metaclass__ = abc.ABCMeta
+
+    _name_filter_type = 'name'
+
+    def filter_by_name(self, name, typing=False):
+        '''
+        Filters the manage list on name. By default the filtered list is
+        loaded straight from its URL; with typing the name is typed into the
+        filter and the suggestion picked, for the tests that are about the
+        filter.
+        '''
+        if typing:
+            self._type_name_filter(name)
+        else:
+            self.go_to_filtered_page(self._manage_path, self._name_filter_type, name)
+
+    @abc.abstractmethod
+    def _type_name_filter(self, name):
+        '''
+        Types the name into the filter and picks its suggestion.
+        '''
+
+    def go_to_filtered_page(self, path, filter_type, name):
+        '''
+        Loads a manage list filtered on name through the filter parameters of
+        its URL, which is where typing into the filter and picking a
+        suggestion ends up. Unlike the filter UI it replaces any filters the
+        list already had.
+
+        Arguments:
+        path -- the path of the manage page, like /manage/products/
+        filter_type -- the data-type of the suggestion, like name or version
+        name -- the value to filter on, or a list of values to show the items
+                matching any of
+        '''
+        names = isinstance(name, basestring) and [name] or name
+        query = urllib.urlencode([('filter-%s' % filter_type, value.lower().encode('utf-8')) for value in names])
+        self.get_relative_path('%s?%s' % (path, query))
+        self.is_the_current_page
@@ -6,45 +6,50 @@
 
 from selenium.webdriver.common.by import By
 
-from pages.base_page import MozTrapBasePage
+from pages.manage_page import MozTrapManagePage
+from pages.page import Locator
 
 
-class MozTrapManageSuitesPage(MozTrapBasePage):
+class MozTrapManageSuitesPage(MozTrapManagePage):
 
     _page_title = 'Manage-Suites'
+    _manage_path = '/manage/suites/'
 
-    _delete_suite_locator = (By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .action-delete')
-    _suite_status_locator = (By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .status-action')
-    _view_cases_locator = ((By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .casecount .drill-link'))
+    _delete_suite_locator = Locator(By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .action-delete')
+    _suite_status_locator = Locator(By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .status-action')
+    _view_cases_locator = Locator(By.CSS_SELECTOR, '#managesuites .itemlist .listitem[data-title="%(suite_name)s"] .casecount .drill-link')
     _filter_input_locator = (By.ID, 'text-filter')
-    _filter_suggestion_locator = (By.CSS_SELECTOR, '#filter .textual .suggest .suggestion[data-type="name"][data-name="%(filter_name)s"]')
-    _filter_locator = (By.CSS_SELECTOR, '#filterform .filter-group input[data-name="name"][value="%(filter_name)s"]:checked')
+    _filter_suggestion_locator = Locator(By.CSS_SELECTOR, '#filter .textual .suggest .suggestion[data-type="name"][data-name="%(filter_name)s"]')
+    _filter_locator = Locator(By.CSS_SELECTOR, '#filterform .filter-group input[data-name="name"][value="%(filter_name)s"]:checked')
 
     def go_to_manage_suites_page(self):
         self.selenium.get(self.base_url + '/manage/suites/')
         self.is_the_current_page
 
     def delete_suite(self, name='Test Suite'):
-        _delete_locator = (self._delete_suite_locator[0], self._delete_suite_locator[1] % {'suite_name': name})
+        _delete_locator = self._delete_suite_locator(suite_name=name)
 
         self.selenium.find_element(*_delete_locator).click()
         self.wait_for_ajax()
 
-    def filter_suites_by_name(self, name):
-        _filter_suggestion_locator = (self._filter_suggestion_locator[0], self._filter_suggestion_locator[1] % {'filter_name': name})
+    def filter_suites_by_name(self, name, typing=False):
+        self.filter_by_name(name, typing=typing)
+
+    def _type_name_filter(self, name):
+        _filter_suggestion_locator = self._filter_suggestion_locator(filter_name=name)
 
         self.selenium.find_element(*self._filter_input_locator).send_keys(name)
         self.selenium.find_element(*_filter_suggestion_locator).click()
         self.wait_for_ajax()
 
     def activate_suite(self, name='Test Suite'):
-        _suite_status_locator = (self._suite_status_locator[0], self._suite_status_locator[1] % {'suite_name': name})
+        _suite_status_locator = self._suite_status_locator(suite_name=name)
 
-        self.selenium.find_element(*self._suite_status_locator).click()
+        self.selenium.find_element(*_suite_status_locator).click()
         self.wait_for_ajax()
 
     def view_cases(self, name='Test Suite'):
-        _view_cases_locator = (self._view_cases_locator[0], self._view_cases_locator[1] % {'suite_name': name})
+        _view_cases_locator = self._view_cases_locator(suite_name=name)
         self.selenium.find_element(*_view_cases_locator).click()
         from pages.manage_cases_page import MozTrapManageCasesPage
         return MozTrapManageCasesPage(self.testsetup)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+from unittestzero import Assert
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+
+from pages.page import Locator
+from pages.page import Page
+
+
+class MozTrapMultiselect(Page):
+    '''
+    The two-list multiselect of a create form, like the suites of a run or
+    the cases of a suite.
+
+    Items are picked by their data-title, all of them in one script call
+    however many there are, then moved with a single click on include.
+    '''
+
+    _include_locator = Locator(By.CSS_SELECTOR, '%(form)s .multiselect .include-exclude .action-include')
+
+    # checks the items of the unselected list with the given [titles]; when
+    # some are not in the list (yet) it checks none and returns their titles
+    _select_items_script = '''
+        var form = document.querySelector(arguments[0]);
+        var items = form ? form.querySelectorAll('.multiselect .multiunselected .itemlist .selectitem') : [];
+        var byTitle = {};
+        for (var i = 0; i < items.length; i++) {
+            byTitle[items[i].getAttribute('data-title')] = items[i];
+        }
+        var missing = [];
+        for (var i = 0; i < arguments[1].length; i++) {
+            if (!Object.prototype.hasOwnProperty.call(byTitle, arguments[1][i])) {
+                missing.push(arguments[1][i]);
+            }
+        }
+        if (missing.length) {
+            return missing;
+        }
+        for (var i = 0; i < arguments[1].length; i++) {
+            var input = byTitle[arguments[1][i]].querySelector('input.bulk-value');
+            if (!input.checked) {
+                input.checked = true;
+                var event = document.createEvent('HTMLEvents');
+                event.initEvent('change', true, false);
+                input.dispatchEvent(event);
+            }
+        }
+        return missing;
+    '''
+
+    # returns the [titles] that are not in the selected list
+    _unselected_items_script = '''
+        var items = document.querySelectorAll(arguments[0] + ' .multiselect .multiselected .itemlist .selectitem');
+        var selected = {};
+        for (var i = 0; i < items.length; i++) {
+            selected[items[i].getAttribute('data-title')] = true;
+        }
+        var unselected = [];
+        for (var i = 0; i < arguments[1].length; i++) {
+            if (!Object.prototype.hasOwnProperty.call(selected, arguments[1][i])) {
+                unselected.push(arguments[1][i]);
+            }
+        }
+        return unselected;
+    '''
+
+    def __init__(self, testsetup, form):
+        '''
+        Arguments:
+        form -- CSS selector of the form the multiselect is in
+        '''
+        Page.__init__(self, testsetup)
+        self.form = form
+
+    def include(self, titles):
+        '''
+        Moves the items with these titles to the selected list.
+
+        The unselected list is loaded by AJAX after the product changes, so
+        this waits for all the items to be there first.
+        '''
+        titles = list(titles)
+        missing = []
+
+        def select_items(selenium):
+            missing[:] = selenium.execute_script(self._select_items_script, self.form, titles)
+            return not missing
+
+        try:
+            WebDriverWait(self.selenium, self.timeout).until(select_items)
+        except TimeoutException:
+            raise NoSuchElementException(u'Unable to find %s in the multiselect of %s' % (u', '.join(missing), self.form))
+
+        self.selenium.find_element(*self._include_locator(form=self.form)).click()
+
+        Assert.equal(self.unselected(titles), [], u'not included in the multiselect of %s' % self.form)
+
+    def unselected(self, titles):
+        '''
+        Returns the titles that are not in the selected list.
+        '''
+        return self.selenium.execute_script(self._unselected_items_script, self.form, list(titles))
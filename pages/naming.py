@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+
+import optparse
+import re
+from datetime import datetime
+from datetime import timedelta
+
+
+class MozTrapNaming(object):
+    '''
+    Names the data the tests create.
+
+    Every name starts with a prefix of the run and the pytest-xdist worker
+    that created it, mt<run id>.<worker id>, like mt20121105143000.gw0. The
+    run id is the time the run started, so data left behind by runs that
+    crashed or were interrupted can be found by its prefix and swept away.
+    '''
+
+    _prefix_pattern = re.compile(r'^mt(?P<run_id>\d{14})\.(?P<worker>\w+) ')
+
+    def __init__(self, run_id=None, worker='master'):
+        self.run_id = run_id or datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        self.worker = worker
+
+    @property
+    def prefix(self):
+        return 'mt%s.%s' % (self.run_id, self.worker)
+
+    def unique(self, name, dt_string):
+        '''
+        Returns the name stamped with the prefix and the creation time.
+        '''
+        return u'%(prefix)s %(name)s %(dt_string)s' % {'prefix': self.prefix, 'name': name, 'dt_string': dt_string}
+
+    def started(self, name):
+        '''
+        Returns when the run that created the data with this name started,
+        or None for names without a prefix.
+        '''
+        match = self._prefix_pattern.match(name)
+        return match and datetime.strptime(match.group('run_id'), '%Y%m%d%H%M%S')
+
+    def is_stale(self, name, max_age):
+        '''
+        Tells whether the name has the prefix of another run that started
+        more than max_age (a timedelta) ago.
+        '''
+        started = self.started(name)
+        return bool(started) and not name.startswith('mt%s.' % self.run_id) and datetime.utcnow() - started > max_age
+
+
+# the naming of this process, configured by conftest.py
+naming = MozTrapNaming()
+
+
+class MozTrapStaleSweeper(object):
+    '''
+    Deletes the data of runs that started too long ago through the API.
+
+    Suites, cases, runs and versions belong to a product and are deleted with
+    it, so only products, profiles and environment categories are swept.
+    '''
+
+    # in this order, so profiles are gone before their categories
+    _resources = ('product', 'profile', 'category')
+
+    def __init__(self, api, naming=naming):
+        self.api = api
+        self.naming = naming
+
+    def sweep(self, max_age):
+        '''
+        Returns a report line for every product, profile and category deleted.
+
+        Arguments:
+        max_age -- a timedelta; data of runs younger than this is kept, as
+                   those may still be running
+        '''
+        report = []
+        for resource in self._resources:
+            for obj in self.api.get(resource, limit=0, name__startswith='mt')['objects']:
+                if self.naming.is_stale(obj['name'], max_age):
+                    self.api.delete(obj['resource_uri'], missing_ok=True)
+                    report.append(u'deleted stale %s %s' % (resource, obj['name']))
+        return report
+
+
+def main():
+    parser = optparse.OptionParser(usage='python -m pages.naming [options]',
+                                   description='deletes the data MozTrap test runs left behind')
+    parser.add_option('--baseurl', dest='base_url', help='base URL of the MozTrap instance.')
+    parser.add_option('--credentials', metavar='path', help='credentials.yaml with an api_key for the default user.')
+    parser.add_option('--maxage', type='float', default=24, metavar='hours',
+                      help='keep the data of runs that started less than this many hours ago. (default: %default)')
+    options, args = parser.parse_args()
+    if not options.base_url or not options.credentials:
+        parser.error('--baseurl and --credentials are required')
+
+    import yaml
+    from pages.api import MozTrapAPI
+
+    class TestSetup(object):
+        base_url = options.base_url.rstrip('/')
+        with open(options.credentials) as credentials_file:
+            credentials = yaml.load(credentials_file)
+
+    for line in MozTrapStaleSweeper(MozTrapAPI(TestSetup())).sweep(timedelta(hours=options.maxage)):
+        print(line.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,158 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
+import re
+
 from unittestzero import Assert
 
+from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import InvalidSelectorException
 from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+
+
+class Locator(tuple):
+    """
+    A (by, value) locator whose value can hold %(name)s placeholders.
+
+    Calling a Locator with values for its placeholders returns the filled in
+    Locator, which is memoized so hot loops do not format the same selector
+    over and over. CSS and XPath templates are checked for unbalanced
+    brackets and quotes when they are created, which for page object class
+    attributes means when the module is imported.
+
+    A Locator is a tuple, so it can be passed on as *locator like any other.
+    """
+
+    cache_size = 256
+
+    _placeholder = re.compile(r'%\((\w+)\)s')
+    _brackets = {'(': ')', '[': ']'}
+
+    def __new__(cls, by, value, check_syntax=True):
+        locator = tuple.__new__(cls, (by, value))
+        locator.placeholders = frozenset(cls._placeholder.findall(value))
+        locator._cache = {}
+        locator._cache_order = []
+        if check_syntax:
+            locator._check_syntax()
+        return locator
+
+    def __getnewargs__(self):
+        return tuple(self)
+
+    @property
+    def by(self):
+        return self[0]
+
+    @property
+    def value(self):
+        return self[1]
+
+    def __call__(self, **kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key in self._cache:
+            self._cache_order.remove(key)
+            self._cache_order.append(key)
+            return self._cache[key]
+
+        if set(kwargs) != self.placeholders:
+            raise KeyError('%r takes the placeholders %s, not %s' % (self, sorted(self.placeholders), sorted(kwargs)))
+        locator = Locator(self.by, self.value % kwargs, check_syntax=False)
+
+        if len(self._cache_order) >= self.cache_size:
+            del self._cache[self._cache_order.pop(0)]
+        self._cache[key] = locator
+        self._cache_order.append(key)
+        return locator
+
+    def _check_syntax(self):
+        if self.by not in (By.CSS_SELECTOR, By.XPATH):
+            return
+        value = self._placeholder.sub('x', self.value).replace('%%', '')
+        if '%' in value:
+            raise InvalidSelectorException('%r has a %% that is not a %%(name)s placeholder' % (self, ))
+
+        expected = []
+        quote = None
+        escaped = False
+        for position, char in enumerate(value):
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char in self._brackets:
+                expected.append(self._brackets[char])
+            elif char in self._brackets.values():
+                if not expected or expected.pop() != char:
+                    raise InvalidSelectorException('%r has an unbalanced %r at position %s' % (self, char, position))
+        if quote:
+            raise InvalidSelectorException('%r has an unclosed %s' % (self, quote))
+        if expected:
+            raise InvalidSelectorException('%r is missing a closing %r' % (self, expected[-1]))
+
+
+def _page_unloaded(exception):
+    # how the drivers fail an async script when the page it runs in unloads,
+    # as opposed to an error in the script
+    return 'unloaded' in (exception.msg or '').lower()
+
+
+class Condition(object):
+    """
+    Something Page.wait_until waits for, checked in the browser.
+
+    Made with the class methods, like Condition.visible(locator).
+    """
+
+    _kinds = ('present', 'gone', 'visible', 'hidden', 'no_ajax')
+
+    def __init__(self, kind, locator=None):
+        if kind not in self._kinds:
+            raise ValueError('Unsupported condition: %s' % kind)
+        self.kind = kind
+        self.locator = locator
+
+    @classmethod
+    def present(cls, locator):
+        """An element matches the locator."""
+        return cls('present', locator)
+
+    @classmethod
+    def gone(cls, locator):
+        """No element matches the locator."""
+        return cls('gone', locator)
+
+    @classmethod
+    def visible(cls, locator):
+        """The element matching the locator is there and visible."""
+        return cls('visible', locator)
+
+    @classmethod
+    def hidden(cls, locator):
+        """The element matching the locator is gone or not visible."""
+        return cls('hidden', locator)
+
+    @classmethod
+    def no_ajax(cls):
+        """jQuery has no AJAX requests in flight."""
+        return cls('no_ajax')
+
+    @property
+    def script_args(self):
+        return [self.kind] + list(self.locator or ())
+
+    def __repr__(self):
+        if not self.locator:
+            return self.kind
+        return '%s %s=%s' % (self.kind, self.locator[0], self.locator[1])
 
 
 class Page(object):
@@ -15,6 +163,234 @@ class Page(object):
     Base class for all Pages
     """
 
+    # defines locate(by, value), which finds the first element matching a
+    # WebDriver locator in the page, or returns null
+    _locate_element_script = """
+        var locate = function(by, value) {
+            switch (by) {
+                case 'id':
+                    return document.getElementById(value);
+                case 'name':
+                    return document.getElementsByName(value)[0] || null;
+                case 'class name':
+                    return document.getElementsByClassName(value)[0] || null;
+                case 'tag name':
+                    return document.getElementsByTagName(value)[0] || null;
+                case 'css selector':
+                    return document.querySelector(value);
+                case 'xpath':
+                    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                case 'link text':
+                case 'partial link text':
+                    var links = document.getElementsByTagName('a');
+                    for (var i = 0; i < links.length; i++) {
+                        var text = (links[i].innerText || links[i].textContent).replace(/^\\s+|\\s+$/g, '');
+                        if (by == 'link text' ? text == value : text.indexOf(value) != -1) {
+                            return links[i];
+                        }
+                    }
+                    return null;
+            }
+            throw new Error('Unsupported locator strategy: ' + by);
+        };
+        var isVisible = function(element) {
+            var style = window.getComputedStyle(element, null);
+            if (style.visibility == 'hidden' || style.opacity == '0') {
+                return false;
+            }
+            for (var node = element; node && node.nodeType == 1; node = node.parentNode) {
+                if (window.getComputedStyle(node, null).display == 'none') {
+                    return false;
+                }
+            }
+            return element.offsetWidth > 0 || element.offsetHeight > 0;
+        };
+    """
+
+    _elements_state_script = """
+        var states = [];
+        for (var i = 0; i < arguments[0].length; i++) {
+            var element = locate(arguments[0][i][0], arguments[0][i][1]);
+            var visible = element !== null && isVisible(element);
+            states.push({
+                'present': element !== null,
+                'visible': visible,
+                'text': visible ? (element.innerText || element.textContent).replace(/^\\s+|\\s+$/g, '') : null
+            });
+        }
+        return states;
+    """
+
+    # defines unmet(conditions), which returns the indexes of the
+    # [kind, by, value] conditions that do not hold
+    _conditions_script = """
+        var holds = function(condition) {
+            var element;
+            switch (condition[0]) {
+                case 'no_ajax':
+                    return !window.jQuery || jQuery.active == 0;
+                case 'present':
+                    return locate(condition[1], condition[2]) !== null;
+                case 'gone':
+                    return locate(condition[1], condition[2]) === null;
+                case 'visible':
+                    element = locate(condition[1], condition[2]);
+                    return element !== null && isVisible(element);
+                case 'hidden':
+                    element = locate(condition[1], condition[2]);
+                    return element === null || !isVisible(element);
+            }
+            throw new Error('Unsupported condition: ' + condition[0]);
+        };
+        var unmet = function(conditions) {
+            var indexes = [];
+            for (var i = 0; i < conditions.length; i++) {
+                if (!holds(conditions[i])) {
+                    indexes.push(i);
+                }
+            }
+            return indexes;
+        };
+    """
+
+    # completes with null as soon as all the conditions arguments[0] hold, or
+    # with the indexes of those that do not after arguments[1] milliseconds;
+    # they are checked again on every change to the page, when the AJAX
+    # requests stop, and every 100ms for what changes neither, like a CSS
+    # transition
+    _wait_until_script = """
+        var done = arguments[arguments.length - 1];
+        var conditions = arguments[0];
+        if (!unmet(conditions).length) {
+            done(null);
+            return;
+        }
+        var finished = false, observer = null, interval, timer;
+        var finish = function(result) {
+            finished = true;
+            if (observer) {
+                observer.disconnect();
+            }
+            clearInterval(interval);
+            clearTimeout(timer);
+            done(result);
+        };
+        var check = function() {
+            if (!finished && !unmet(conditions).length) {
+                finish(null);
+            }
+        };
+        var checkOnAjaxStop = function() {
+            check();
+            if (!finished) {
+                window.__moztrapAjax.waiting.push(checkOnAjaxStop);
+            }
+        };
+        if (window.MutationObserver) {
+            observer = new MutationObserver(check);
+            observer.observe(document.documentElement, {'childList': true, 'subtree': true, 'attributes': true, 'characterData': true});
+        }
+        if (window.__moztrapAjax) {
+            window.__moztrapAjax.waiting.push(checkOnAjaxStop);
+        }
+        interval = setInterval(check, 100);
+        timer = setTimeout(function() {
+            finish(unmet(conditions));
+        }, arguments[1]);
+    """
+
+    # defines selectOption(element, text, value), which selects the option of
+    # the select with the visible text or, when text is null, the value and
+    # returns an error message when there is none, or null; and fire(element,
+    # name), which dispatches the event the way a user's change would
+    _select_option_script = """
+        var normalize = function(text) {
+            return text.replace(/\\s+/g, ' ').replace(/^ | $/g, '');
+        };
+        var fire = function(element, name) {
+            var event = document.createEvent('HTMLEvents');
+            event.initEvent(name, true, false);
+            element.dispatchEvent(event);
+        };
+        var selectOption = function(element, text, value) {
+            var options = element.options, wanted = text === null ? value : normalize(text);
+            for (var i = 0; i < options.length; i++) {
+                if (text === null ? options[i].value == wanted : normalize(options[i].text) == wanted) {
+                    element.selectedIndex = i;
+                    return null;
+                }
+            }
+            return text === null ? 'Cannot locate option with value: ' + value : 'Cannot locate option with visible text: ' + text;
+        };
+    """
+
+    _select_script = """
+        var element = locate(arguments[0], arguments[1]);
+        if (element === null) {
+            return 'Unable to locate element: ' + arguments[0] + '=' + arguments[1];
+        }
+        if (element.tagName.toLowerCase() != 'select') {
+            return 'Element is not a select: ' + arguments[0] + '=' + arguments[1];
+        }
+        var error = selectOption(element, arguments[2], arguments[3]);
+        if (error) {
+            return error + ' in ' + arguments[0] + '=' + arguments[1];
+        }
+        fire(element, 'input');
+        fire(element, 'change');
+        return null;
+    """
+
+    # fills in [by, value, field value] fields in order and returns an error
+    # message for the first one it could not fill in, or null
+    _fill_form_script = """
+        for (var i = 0; i < arguments[0].length; i++) {
+            var field = arguments[0][i];
+            var element = locate(field[0], field[1]);
+            if (element === null) {
+                return 'Unable to locate element: ' + field[0] + '=' + field[1];
+            }
+            if (element.tagName.toLowerCase() == 'select') {
+                var error = selectOption(element, field[2], null);
+                if (error) {
+                    return error + ' in ' + field[0] + '=' + field[1];
+                }
+            } else if (element.type == 'checkbox' || element.type == 'radio') {
+                element.checked = field[2];
+            } else {
+                element.value = field[2];
+            }
+            fire(element, 'input');
+            fire(element, 'change');
+        }
+        return null;
+    """
+
+    # installs window.__moztrapAjax once per page load; every time jQuery's
+    # ajaxStop fires it bumps the generation and releases the waiting callbacks
+    _ajax_hook_script = """
+        if (window.jQuery && !window.__moztrapAjax) {
+            var hook = window.__moztrapAjax = {'generation': 0, 'waiting': []};
+            jQuery(document).ajaxStop(function() {
+                hook.generation++;
+                var waiting = hook.waiting;
+                hook.waiting = [];
+                for (var i = 0; i < waiting.length; i++) {
+                    waiting[i](hook.generation);
+                }
+            });
+        }
+    """
+
+    _wait_for_ajax_script = """
+        var done = arguments[arguments.length - 1];
+        if (!window.jQuery || jQuery.active == 0) {
+            done(window.__moztrapAjax ? window.__moztrapAjax.generation : 0);
+        } else {
+            window.__moztrapAjax.waiting.push(done);
+        }
+    """
+
     def __init__(self, testsetup):
         self.testsetup = testsetup
         self.base_url = testsetup.base_url
@@ -51,6 +427,78 @@ class Page(object):
             # set back to where you once belonged
             self.selenium.implicitly_wait(self.testsetup.default_implicit_wait)
 
+    def is_element_absent(self, by, value):
+        """
+        Tells whether no element matches the locator, right away.
+
+        Unlike not is_element_present this is a single script call, with no
+        implicit wait to switch off and on again around it.
+        """
+
+        return self.selenium.execute_script(self._locate_element_script + 'return locate(arguments[0], arguments[1]) === null;',
+                                            by, value)
+
+    def wait_until_gone(self, by, value, timeout=None):
+        """
+        Waits for the element matching the locator to go, like a list item
+        deleted through AJAX, and tells whether it did.
+
+        Arguments:
+        by, value -- the locator of the element
+        timeout -- seconds to wait at most (default: the timeout of the run)
+        """
+
+        try:
+            self.wait_until(Condition.gone((by, value)), timeout=timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def wait_until(self, *conditions, **kwargs):
+        """
+        Waits until all the conditions hold at the same time, like
+        wait_until(Condition.visible(locator), Condition.no_ajax()).
+
+        The waiting is done in the browser by a single script call, which
+        checks again every time the page changes or AJAX requests stop rather
+        than being polled over the wire, so it returns as soon as they hold.
+        Raises TimeoutException naming the conditions that did not.
+
+        Arguments:
+        conditions -- Condition instances
+        timeout -- seconds to wait at most (default: the timeout of the run)
+        """
+
+        timeout = kwargs.pop('timeout', None)
+        if kwargs:
+            raise TypeError('wait_until() got unexpected keyword arguments: %s' % ', '.join(sorted(kwargs)))
+        if timeout is None:
+            timeout = self.timeout
+        script_conditions = [condition.script_args for condition in conditions]
+        self._set_script_timeout(timeout + 1)
+        try:
+            unmet = self.selenium.execute_async_script(
+                self._locate_element_script + self._conditions_script + self._ajax_hook_script + self._wait_until_script,
+                script_conditions, int(timeout * 1000))
+        except TimeoutException:
+            unmet = range(len(conditions))
+        except WebDriverException as exception:
+            if not _page_unloaded(exception):
+                raise
+            # the page was unloaded while waiting, so fall back to polling the new one
+            unmet = []
+
+            def all_hold(selenium):
+                unmet[:] = selenium.execute_script(self._locate_element_script + self._conditions_script + 'return unmet(arguments[0]);',
+                                                   script_conditions)
+                return not unmet
+            try:
+                WebDriverWait(self.selenium, timeout).until(all_hold)
+            except TimeoutException:
+                pass
+        if unmet:
+            raise TimeoutException('Timed out after %s seconds waiting for %s' % (timeout, ', '.join(repr(conditions[i]) for i in unmet)))
+
     def is_element_visible(self, by, value):
         try:
             return self.selenium.find_element(by, value).is_displayed()
@@ -58,9 +506,49 @@ class Page(object):
             # this will return a snapshot, which takes time.
             return False
 
+    def get_elements_state(self, *locators):
+        """
+        Returns the state of the first element matching each locator, found
+        with a single script call instead of several WebDriver commands per
+        locator.
+
+        Each state is a dict with the keys 'present', 'visible' and 'text'
+        (the visible text, or None when the element is not visible).
+
+        Arguments:
+        locators -- (by, value) locators for the elements
+        """
+
+        return self.selenium.execute_script(self._locate_element_script + self._elements_state_script,
+                                            [list(locator) for locator in locators])
+
     def wait_for_ajax(self):
-        WebDriverWait(self.selenium, self.timeout).until(lambda s: s.execute_script("return $.active == 0"),
-                                                         "Wait for AJAX timed out after %s seconds" % self.timeout)
+        """
+        Waits until jQuery has no AJAX requests in flight.
+
+        Rather than polling $.active, this blocks in a single async script
+        call that the in-page ajaxStop hook completes as soon as the last
+        request finishes.
+        """
+
+        self._set_script_timeout(self.timeout)
+        try:
+            self.selenium.execute_async_script(self._ajax_hook_script + self._wait_for_ajax_script)
+        except TimeoutException:
+            raise TimeoutException("Wait for AJAX timed out after %s seconds" % self.timeout)
+        except WebDriverException as exception:
+            if not _page_unloaded(exception):
+                raise
+            # the page was unloaded while waiting, so fall back to polling the new one
+            WebDriverWait(self.selenium, self.timeout).until(lambda s: s.execute_script("return $.active == 0"),
+                                                             "Wait for AJAX timed out after %s seconds" % self.timeout)
+
+    def _set_script_timeout(self, seconds):
+        # the async scripts need at least this long; the browser keeps it, so
+        # it is only sent when a longer one is needed
+        if getattr(self.selenium, '_moztrap_script_timeout', 0) < seconds:
+            self.selenium.set_script_timeout(seconds)
+            self.selenium._moztrap_script_timeout = seconds
 
     def type_in_element(self, locator, text):
         """
@@ -76,3 +564,64 @@ class Page(object):
         text_fld = self.selenium.find_element(*locator)
         text_fld.clear()
         text_fld.send_keys(text)
+
+    def select_option(self, locator, text=None, value=None):
+        """
+        Selects the option of a select with the visible text, or the value,
+        and fires the input and change events, in a single script call.
+
+        Unlike Select, which fetches every option and compares it over the
+        wire, the options are searched in the browser, so a select with
+        thousands of them takes no longer than one with a few. Raises
+        NoSuchElementException when no option matches.
+
+        Arguments:
+        locator -- the locator of the select
+        text -- the visible text of the option; runs of white space count as one
+        value -- the value of the option, when no text is given
+        """
+
+        if text is None and value is None:
+            raise ValueError('select_option needs the text or the value of the option')
+        error = self.selenium.execute_script(self._locate_element_script + self._select_option_script + self._select_script,
+                                             locator[0], locator[1], text, value)
+        if error:
+            raise NoSuchElementException(error)
+
+    def fill_form(self, fields, typing=False):
+        """
+        Fills in form fields with a single script call.
+
+        Text inputs and textareas get the value, selects have the option with
+        the value as its visible text selected and checkboxes are checked or
+        unchecked for True or False. Each field then gets the input and change
+        events the MozTrap scripts listen to.
+
+        With typing the fields are filled in one by one through WebDriver
+        instead, with real key presses for text, for the tests that are about
+        keyboard input.
+
+        Arguments:
+        fields -- (locator, value) pairs, filled in in order
+        typing -- fill in the fields the way a user would
+        """
+
+        if typing:
+            for locator, value in fields:
+                element = self.selenium.find_element(*locator)
+                if element.tag_name.lower() == 'select':
+                    # Select compares the text of every option over the wire,
+                    # which takes seconds on the product and version selects
+                    self.select_option(locator, text=value)
+                elif element.get_attribute('type') in ('checkbox', 'radio'):
+                    if element.is_selected() != value:
+                        element.click()
+                else:
+                    element.clear()
+                    element.send_keys(value)
+            return
+
+        error = self.selenium.execute_script(self._locate_element_script + self._select_option_script + self._fill_form_script,
+                                             [[locator[0], locator[1], value] for locator, value in fields])
+        if error:
+            raise NoSuchElementException(error)
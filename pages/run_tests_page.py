@@ -7,39 +7,111 @@
 from selenium.webdriver.common.by import By
 
 from pages.base_page import MozTrapBasePage
+from pages.page import Locator
 
 
 class MozTrapRunTestsPage(MozTrapBasePage):
 
     _page_title = 'Run Tests'
 
-    _test_pass_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .action-pass')
-    _test_is_passed_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem.passed[data-title="%(case_name)s"]')
-    _test_is_failed_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem.failed[data-title="%(case_name)s"]')
-    _test_is_invalid_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem.invalidated[data-title="%(case_name)s"]')
-    _test_summary_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .item-summary')
-    _step_fail_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-summary')
-    _step_fail_result_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-content .fail-field textarea[name="comment"]')
-    _step_fail_submit_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-content .form-actions .fail')
-    _test_invalid_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-summary')
-    _test_invalid_desc_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-form .invalid-input')
-    _test_invalid_submit_locator = (By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-form .form-actions .invalid')
+    _test_pass_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .action-pass')
+    _test_summary_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .item-summary')
+    _step_fail_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-summary')
+    _step_fail_result_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-content .fail-field textarea[name="comment"]')
+    _step_fail_submit_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .steps .stepitem[data-step-number="%(step_number)s"] .stepfail .stepfail-content .form-actions .fail')
+    _test_invalid_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-summary')
+    _test_invalid_desc_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-form .invalid-input')
+    _test_invalid_submit_locator = Locator(By.CSS_SELECTOR, '#runtests .itemlist .listitem[data-title="%(case_name)s"] .itembody .testinvalid .invalid-form .form-actions .invalid')
+
+    # returns {case title: status} for every test in the list, the status
+    # being the result class of its list item
+    _results_script = '''
+        var results = {};
+        var items = document.querySelectorAll('#runtests .itemlist .listitem[data-title]');
+        for (var i = 0; i < items.length; i++) {
+            var classes = ' ' + items[i].className + ' ';
+            var status = 'untested';
+            var statuses = ['passed', 'failed', 'invalidated'];
+            for (var j = 0; j < statuses.length; j++) {
+                if (classes.indexOf(' ' + statuses[j] + ' ') != -1) {
+                    status = statuses[j];
+                }
+            }
+            results[items[i].getAttribute('data-title')] = status;
+        }
+        return results;
+    '''
+
+    # records [case title, result, step number, comment] for every entry of
+    # arguments[0] by clicking through the test list the way a user does,
+    # without waiting in between: the summary opens the test, the fail or
+    # invalid button of a step opens its form, and only controls that have
+    # become visible are clicked; returns the titles of the tests it could
+    # not record that way
+    _record_results_script = '''
+        var reveal = function(controls) {
+            for (var j = 0; j < controls.length; j++) {
+                if (!controls[j]) {
+                    return null;
+                }
+                if (j + 1 < controls.length && controls[j + 1] && !isVisible(controls[j + 1]) && isVisible(controls[j])) {
+                    controls[j].click();
+                }
+            }
+            var last = controls[controls.length - 1];
+            return isVisible(last) ? last : null;
+        };
+        var items = document.querySelectorAll('#runtests .itemlist .listitem[data-title]');
+        var byTitle = {};
+        for (var i = 0; i < items.length; i++) {
+            byTitle[items[i].getAttribute('data-title')] = items[i];
+        }
+        var missing = [];
+        for (var i = 0; i < arguments[0].length; i++) {
+            var title = arguments[0][i][0], result = arguments[0][i][1];
+            var item = Object.prototype.hasOwnProperty.call(byTitle, title) ? byTitle[title] : null;
+            var summary = item && item.querySelector('.itembody .item-summary');
+            var form = null, submit = null;
+            if (item && result == 'pass') {
+                submit = reveal([summary, item.querySelector('.itembody .action-pass')]);
+            } else if (item && result == 'fail') {
+                var step = item.querySelector('.itembody .steps .stepitem[data-step-number="' + arguments[0][i][2] + '"]');
+                form = step && step.querySelector('.stepfail .stepfail-content');
+                submit = form && reveal([summary, step.querySelector('.stepfail .stepfail-summary'), form.querySelector('.form-actions .fail')]);
+            } else if (item && result == 'invalid') {
+                form = item.querySelector('.itembody .testinvalid .invalid-form');
+                submit = form && reveal([summary, item.querySelector('.itembody .testinvalid .invalid-summary'), form.querySelector('.form-actions .invalid')]);
+            }
+            if (!submit) {
+                missing.push(title);
+                continue;
+            }
+            if (form) {
+                form.querySelector('textarea').value = arguments[0][i][3];
+            }
+            submit.click();
+        }
+        return missing;
+    '''
+
+    # what get_results reports for each result recorded
+    _recorded_statuses = {'pass': 'passed', 'fail': 'failed', 'invalid': 'invalidated'}
 
     def open_test_summary(self, case_name):
-        _open_test = (self._test_summary_locator[0], self._test_summary_locator[1] % {'case_name': case_name})
+        _open_test = self._test_summary_locator(case_name=case_name)
         self.selenium.find_element(*_open_test).click()
 
     def pass_test(self, case_name):
-        _pass_test_locator = (self._test_pass_locator[0], self._test_pass_locator[1] % {'case_name': case_name})
+        _pass_test_locator = self._test_pass_locator(case_name=case_name)
 
         self.open_test_summary(case_name)
         self.selenium.find_element(*_pass_test_locator).click()
         self.wait_for_ajax()
 
     def fail_test(self, case_name, step_number=1):
-        _step_fail_locator = (self._step_fail_locator[0], self._step_fail_locator[1] % {'case_name': case_name, 'step_number': step_number})
-        _step_fail_result_locator = (self._step_fail_result_locator[0], self._step_fail_result_locator[1] % {'case_name': case_name, 'step_number': step_number})
-        _step_fail_submit_locator = (self._step_fail_submit_locator[0], self._step_fail_submit_locator[1] % {'case_name': case_name, 'step_number': step_number})
+        _step_fail_locator = self._step_fail_locator(case_name=case_name, step_number=step_number)
+        _step_fail_result_locator = self._step_fail_result_locator(case_name=case_name, step_number=step_number)
+        _step_fail_submit_locator = self._step_fail_submit_locator(case_name=case_name, step_number=step_number)
         _step_fail_result = u'%(case_name)s step %(step_number)s failed' % {'step_number': step_number, 'case_name': case_name}
 
         self.open_test_summary(case_name)
@@ -49,9 +121,9 @@ class MozTrapRunTestsPage(MozTrapBasePage):
         self.wait_for_ajax()
 
     def mark_test_invalid(self, case_name):
-        _test_invalid_locator = (self._test_invalid_locator[0], self._test_invalid_locator[1] % {'case_name': case_name})
-        _test_invalid_desc_locator = (self._test_invalid_desc_locator[0], self._test_invalid_desc_locator[1] % {'case_name': case_name})
-        _test_invalid_submit_locator = (self._test_invalid_submit_locator[0], self._test_invalid_submit_locator[1] % {'case_name': case_name})
+        _test_invalid_locator = self._test_invalid_locator(case_name=case_name)
+        _test_invalid_desc_locator = self._test_invalid_desc_locator(case_name=case_name)
+        _test_invalid_submit_locator = self._test_invalid_submit_locator(case_name=case_name)
         _test_invalid_desc = u'%(case_name)s is invalid' % {'case_name': case_name}
 
         self.open_test_summary(case_name)
@@ -60,17 +132,67 @@ class MozTrapRunTestsPage(MozTrapBasePage):
         self.selenium.find_element(*_test_invalid_submit_locator).click()
         self.wait_for_ajax()
 
-    def is_test_passed(self, case_name):
-        _test_is_passed_locator = (self._test_is_passed_locator[0], self._test_is_passed_locator[1] % {'case_name': case_name})
+    def record_results(self, results):
+        '''
+        Records the results of many tests at once and returns a dict of case
+        name to whether the result was recorded.
+
+        All the results are submitted in one script call, one AJAX request
+        per test, and they are all waited for once at the end instead of
+        after each test, which is what makes runs of hundreds of tests bearable.
+        The script clicks the same controls as pass_test, fail_test and
+        mark_test_invalid, and only once they are visible, but it sets the
+        comments instead of typing them.
+
+        Arguments:
+        results -- dict of case name to 'pass', 'fail' or 'invalid', or to a
+                   dict with:
+                   result -- 'pass', 'fail' or 'invalid'
+                   step_number -- the step a failed test failed at (default: 1)
+                   comment -- the comment of a failed or invalid test
+                              (default: the one fail_test or
+                              mark_test_invalid would type)
+        '''
+        batch = []
+        for case_name, outcome in results.items():
+            if not isinstance(outcome, dict):
+                outcome = {'result': outcome}
+            result = outcome['result']
+            step_number = int(outcome.get('step_number', 1))
+            if result == 'fail':
+                comment = u'%(case_name)s step %(step_number)s failed' % {'step_number': step_number, 'case_name': case_name}
+            else:
+                comment = u'%(case_name)s is invalid' % {'case_name': case_name}
+            batch.append((case_name, result, step_number, outcome.get('comment', comment)))
+
+        missing = self.selenium.execute_script(self._locate_element_script + self._record_results_script, batch)
+        self.wait_for_ajax()
 
-        return self.is_element_present(*_test_is_passed_locator)
+        statuses = self.get_results()
+        return dict((case_name, case_name not in missing and statuses.get(case_name) == self._recorded_statuses.get(result))
+                    for case_name, result, step_number, comment in batch)
+
+    def get_results(self):
+        '''
+        Returns the results of all the tests in the run, read in one round
+        trip, as a dict of case name to 'passed', 'failed', 'invalidated' or
+        'untested'. The list is read afresh on every call, so to check many
+        tests call it once and look them up in the dict.
+        '''
+        return self.selenium.execute_script(self._results_script)
+
+    def get_test_status(self, case_name):
+        '''
+        Returns 'passed', 'failed', 'invalidated' or 'untested', or None
+        when the test is not in the run.
+        '''
+        return self.get_results().get(case_name)
 
-    def is_test_failed(self, case_name):
-        _test_is_failed_locator = (self._test_is_failed_locator[0], self._test_is_failed_locator[1] % {'case_name': case_name})
+    def is_test_passed(self, case_name):
+        return self.get_test_status(case_name) == 'passed'
 
-        return self.is_element_present(*_test_is_failed_locator)
+    def is_test_failed(self, case_name):
+        return self.get_test_status(case_name) == 'failed'
 
     def is_test_invalid(self, case_name):
-        _test_is_invalid_locator = (self._test_is_invalid_locator[0], self._test_is_invalid_locator[1] % {'case_name': case_name})
-
-        return self.is_element_present(*_test_is_invalid_locator)
+        return self.get_test_status(case_name) == 'invalidated'
@@ -16,10 +16,10 @@ class TestHomepage(BaseTest):
 
     @pytest.mark.moztrap([3385, 3386])
     @pytest.mark.nondestructive
-    def test_that_user_can_login_and_logout(self, mozwebqa):
+    def test_that_user_can_login_and_logout(self, mozwebqa_pooled):
         from pages.login_page import MozTrapLoginPage
-        login_pg = MozTrapLoginPage(mozwebqa)
-        home_pg = MozTrapHomePage(mozwebqa)
+        login_pg = MozTrapLoginPage(mozwebqa_pooled)
+        home_pg = MozTrapHomePage(mozwebqa_pooled)
 
         home_pg.get_relative_path('/')
 
@@ -40,10 +40,9 @@ class TestHomepage(BaseTest):
         Assert.false(home_pg.header.is_user_logged_in)
 
     @pytest.mark.moztrap(3387)
-    def test_that_user_can_select_product(self, mozwebqa_logged_in):
+    def test_that_user_can_select_product(self, mozwebqa_logged_in, shared_product):
         home_pg = MozTrapHomePage(mozwebqa_logged_in)
-
-        product = self.create_product(mozwebqa_logged_in)
+        product = shared_product
 
         home_pg.go_to_homepage_page()
 
@@ -53,13 +52,10 @@ class TestHomepage(BaseTest):
 
         Assert.true(home_pg.is_element_visible(*product['version']['homepage_locator']))
 
-        self.delete_product(mozwebqa_logged_in, product=product)
-
     @pytest.mark.moztrap(3388)
-    def test_that_user_can_select_version(self, mozwebqa_logged_in):
+    def test_that_user_can_select_version(self, mozwebqa_logged_in, shared_run):
         home_pg = MozTrapHomePage(mozwebqa_logged_in)
-
-        run = self.create_run(mozwebqa_logged_in, activate=True)
+        run = shared_run
 
         home_pg.go_to_homepage_page()
         home_pg.select_item(run['version']['product']['name'])
@@ -70,13 +66,10 @@ class TestHomepage(BaseTest):
 
         Assert.true(home_pg.is_element_visible(*run['homepage_locator']))
 
-        self.delete_product(mozwebqa_logged_in, product=run['version']['product'])
-
     @pytest.mark.moztrap(3414)
-    def test_that_user_can_select_run(self, mozwebqa_logged_in):
+    def test_that_user_can_select_run(self, mozwebqa_logged_in, shared_run):
         home_pg = MozTrapHomePage(mozwebqa_logged_in)
-
-        run = self.create_run(mozwebqa_logged_in, activate=True)
+        run = shared_run
 
         home_pg.go_to_homepage_page()
         home_pg.select_item(run['version']['product']['name'])
@@ -87,5 +80,3 @@ class TestHomepage(BaseTest):
         home_pg.select_item(run['name'])
 
         Assert.true(home_pg.is_element_visible(*run['run_tests_locator']))
-
-        self.delete_product(mozwebqa_logged_in, product=run['version']['product'])
@@ -25,6 +25,4 @@ class TestManageCasesPage(BaseTest):
 
         manage_cases_pg.delete_case(name=case['name'])
 
-        Assert.false(manage_cases_pg.is_element_present(*case['locator']))
-
-        self.delete_product(mozwebqa_logged_in, product=case['product'])
+        Assert.true(manage_cases_pg.wait_until_gone(*case['locator']))
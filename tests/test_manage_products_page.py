@@ -25,7 +25,9 @@ class TestManageProductsPage(BaseTest):
 
         manage_products_pg.delete_product(name=product['name'])
 
-        Assert.false(manage_products_pg.is_element_present(*product['locator']))
+        Assert.true(manage_products_pg.wait_until_gone(*product['locator']))
+
+        self.forget(mozwebqa_logged_in, 'product', product)
 
     @pytest.mark.moztrap(151)
     def test_that_user_can_filter_product_by_name(self, mozwebqa_logged_in):
@@ -33,17 +35,15 @@ class TestManageProductsPage(BaseTest):
 
         product = self.create_product(mozwebqa_logged_in)
 
-        manage_products_pg.filter_products_by_name(name='Another Product')
+        manage_products_pg.filter_products_by_name(name='Another Product', typing=True)
 
-        Assert.false(manage_products_pg.is_element_present(*product['locator']))
+        Assert.true(manage_products_pg.is_element_absent(*product['locator']))
 
         manage_products_pg.remove_name_filter(name='Another Product')
-        manage_products_pg.filter_products_by_name(name=product['name'])
+        manage_products_pg.filter_products_by_name(name=product['name'], typing=True)
 
         Assert.true(manage_products_pg.is_element_present(*product['locator']))
 
-        manage_products_pg.delete_product(name=product['name'])
-
     @pytest.mark.moztrap(3415)
     def test_that_user_can_filter_product_by_name_without_mouse(self, mozwebqa_logged_in):
         manage_products_pg = MozTrapManageProductsPage(mozwebqa_logged_in)
@@ -52,11 +52,9 @@ class TestManageProductsPage(BaseTest):
 
         manage_products_pg.filter_products_by_name_without_mouse(name='Another Product')
 
-        Assert.false(manage_products_pg.is_element_present(*product['locator']))
+        Assert.true(manage_products_pg.is_element_absent(*product['locator']))
 
         manage_products_pg.remove_name_filter(name='Another Product')
         manage_products_pg.filter_products_by_name_without_mouse(name=product['name'])
 
         Assert.true(manage_products_pg.is_element_present(*product['locator']))
-
-        manage_products_pg.delete_product(name=product['name'])
@@ -15,9 +15,7 @@ class TestManageProfilesPage(BaseTest):
 
     @pytest.mark.moztrap([154, 155])
     def test_that_user_can_create_and_delete_profile(self, mozwebqa_logged_in):
-        from pages.create_profile_page import MozTrapCreateProfilePage
         manage_profiles_pg = MozTrapManageProfilesPage(mozwebqa_logged_in)
-        create_profile_pg = MozTrapCreateProfilePage(mozwebqa_logged_in)
 
         profile = self.create_profile(mozwebqa_logged_in)
 
@@ -27,7 +25,6 @@ class TestManageProfilesPage(BaseTest):
 
         manage_profiles_pg.delete_profile(name=profile['name'])
 
-        Assert.false(manage_profiles_pg.is_element_present(*profile['locator']))
+        Assert.true(manage_profiles_pg.wait_until_gone(*profile['locator']))
 
-        create_profile_pg.go_to_create_profile_page()
-        create_profile_pg.delete_environment_category(category_name=profile['category'])
+        self.forget(mozwebqa_logged_in, 'profile', profile)
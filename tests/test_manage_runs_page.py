@@ -25,6 +25,4 @@ class TestManageRunsPage(BaseTest):
 
         manage_runs_pg.delete_run(name=run['name'])
 
-        Assert.false(manage_runs_pg.is_element_present(*run['manage_locator']))
-
-        self.delete_version(mozwebqa_logged_in, version=run['version'], delete_product=True)
+        Assert.true(manage_runs_pg.wait_until_gone(*run['manage_locator']))
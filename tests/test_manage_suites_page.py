@@ -25,9 +25,7 @@ class TestManageSuitesPage(BaseTest):
 
         manage_suites_pg.delete_suite(name=suite['name'])
 
-        Assert.false(manage_suites_pg.is_element_present(*suite['locator']))
-
-        self.delete_product(mozwebqa_logged_in, product=suite['product'])
+        Assert.true(manage_suites_pg.wait_until_gone(*suite['locator']))
 
     def test_that_user_can_create_suite_and_add_some_cases_to_it(self, mozwebqa_logged_in):
         manage_suites_pg = MozTrapManageSuitesPage(mozwebqa_logged_in)
@@ -42,5 +40,5 @@ class TestManageSuitesPage(BaseTest):
 
         manage_test_cases_pg = manage_suites_pg.view_cases(name=suite['name'])
 
-        for case in cases:
-            Assert.true(manage_test_cases_pg.is_element_present(*case['locator']))
+        for state in manage_test_cases_pg.get_elements_state(*[case['locator'] for case in cases]):
+            Assert.true(state['present'])
@@ -26,9 +26,7 @@ class TestManageVersionsPage(BaseTest):
 
         manage_versions_pg.delete_version(name=version['name'], product_name=version['product']['name'])
 
-        Assert.false(manage_versions_pg.is_element_present(*version['manage_locator']))
-
-        self.delete_product(mozwebqa_logged_in, version['product'])
+        Assert.true(manage_versions_pg.wait_until_gone(*version['manage_locator']))
 
     @pytest.mark.moztrap(3391)
     def test_that_user_can_filter_version_by_name(self, mozwebqa_logged_in):
@@ -36,17 +34,15 @@ class TestManageVersionsPage(BaseTest):
 
         version = self.create_version(mozwebqa_logged_in)
 
-        manage_versions_pg.filter_versions_by_name(name='Another Version')
+        manage_versions_pg.filter_versions_by_name(name='Another Version', typing=True)
 
-        Assert.false(manage_versions_pg.is_element_present(*version['manage_locator']))
+        Assert.true(manage_versions_pg.is_element_absent(*version['manage_locator']))
 
         manage_versions_pg.remove_name_filter(name='Another Version')
-        manage_versions_pg.filter_versions_by_name(name=version['name'])
+        manage_versions_pg.filter_versions_by_name(name=version['name'], typing=True)
 
         Assert.true(manage_versions_pg.is_element_present(*version['manage_locator']))
 
-        self.delete_version(mozwebqa_logged_in, version, delete_product=True)
-
     @pytest.mark.moztrap(3392)
     def test_that_user_can_clone_version(self, mozwebqa_logged_in):
         manage_versions_pg = MozTrapManageVersionsPage(mozwebqa_logged_in)
@@ -61,6 +57,4 @@ class TestManageVersionsPage(BaseTest):
 
         manage_versions_pg.delete_version(name=cloned_version['name'], product_name=cloned_version['product_name'])
 
-        Assert.false(manage_versions_pg.is_element_present(*cloned_version['manage_locator']))
-
-        self.delete_version(mozwebqa_logged_in, version, delete_product=True)
+        Assert.true(manage_versions_pg.wait_until_gone(*cloned_version['manage_locator']))
@@ -25,9 +25,6 @@ class TestRunTestsPage(BaseTest):
 
         Assert.true(run_tests_pg.is_test_passed(case_name=case['name']))
 
-        self.delete_product(mozwebqa_logged_in, product=case['product'])
-        self.delete_profile(mozwebqa_logged_in, profile=case['profile'])
-
     @pytest.mark.moztrap(206)
     def test_that_user_can_fail_test(self, mozwebqa_logged_in):
         run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
@@ -40,9 +37,6 @@ class TestRunTestsPage(BaseTest):
 
         Assert.true(run_tests_pg.is_test_failed(case_name=case['name']))
 
-        self.delete_product(mozwebqa_logged_in, product=case['product'])
-        self.delete_profile(mozwebqa_logged_in, profile=case['profile'])
-
     @pytest.mark.moztrap(207)
     def test_that_user_can_mark_test_invalid(self, mozwebqa_logged_in):
         run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
@@ -55,5 +49,18 @@ class TestRunTestsPage(BaseTest):
 
         Assert.true(run_tests_pg.is_test_invalid(case_name=case['name']))
 
-        self.delete_product(mozwebqa_logged_in, product=case['product'])
-        self.delete_profile(mozwebqa_logged_in, profile=case['profile'])
+    @pytest.mark.moztrap([205, 206, 207])
+    def test_that_user_can_record_results_of_many_tests(self, mozwebqa_logged_in):
+        run_tests_pg = MozTrapRunTestsPage(mozwebqa_logged_in)
+
+        passed, failed, invalid = self.create_and_run_tests(mozwebqa_logged_in, count=3)
+
+        recorded = run_tests_pg.record_results({
+            passed['name']: 'pass',
+            failed['name']: {'result': 'fail', 'step_number': 1, 'comment': 'failed in a batch'},
+            invalid['name']: 'invalid'})
+
+        Assert.equal(recorded, {passed['name']: True, failed['name']: True, invalid['name']: True})
+        Assert.true(run_tests_pg.is_test_passed(case_name=passed['name']))
+        Assert.true(run_tests_pg.is_test_failed(case_name=failed['name']))
+        Assert.true(run_tests_pg.is_test_invalid(case_name=invalid['name']))